@@ -5,7 +5,8 @@ Email Agent for handling recruiter emails via Gmail API
 import os
 import base64
 import re
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from email.mime.text import MIMEText
 
@@ -15,17 +16,29 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from utils.retry import RATE_LIMIT_STATUSES, retry_api
+
 
 class EmailAgent:
     """Handles email communication with recruiters"""
     
     SCOPES = ['https://www.googleapis.com/auth/gmail.modify']
     
+    # Gmail's system label IDs double as their names
+    SYSTEM_LABELS = frozenset({
+        'INBOX', 'UNREAD', 'STARRED', 'IMPORTANT', 'SENT', 'DRAFT', 'SPAM', 'TRASH'
+    })
+    
+    # Maximum number of message IDs per batchModify request
+    BATCH_MODIFY_LIMIT = 1000
+    
     def __init__(self, credentials_path: str = "credentials/gmail_credentials.json",
                  token_path: str = "credentials/gmail_token.json"):
         self.credentials_path = credentials_path
         self.token_path = token_path
-        self.service = None
+        self._creds = None
+        # httplib2 connections aren't thread-safe, so each thread gets its own service
+        self._local = threading.local()
         self._authenticate()
     
     def _authenticate(self):
@@ -56,7 +69,27 @@ class EmailAgent:
             with open(self.token_path, 'w') as token:
                 token.write(creds.to_json())
         
-        self.service = build('gmail', 'v1', credentials=creds)
+        self._creds = creds
+        self._local.service = build('gmail', 'v1', credentials=creds)
+    
+    @property
+    def service(self):
+        """Gmail API service for the calling thread"""
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = self._local.service = build('gmail', 'v1', credentials=self._creds,
+                                                  cache_discovery=False)
+        return service
+    
+    @retry_api(max_attempts=5, base=0.5)
+    def execute(self, request):
+        """Execute a Gmail API request, retrying rate limit and transient errors"""
+        return request.execute()
+    
+    @retry_api(max_attempts=5, base=0.5, statuses=RATE_LIMIT_STATUSES)
+    def execute_write(self, request):
+        """Execute a Gmail API request that changes the mailbox, retrying only rate limits"""
+        return request.execute()
     
     def get_unread_recruiter_emails(self, max_results: int = 10) -> List[Dict]:
         """
@@ -76,36 +109,88 @@ class EmailAgent:
             # Search for unread emails
             query = "is:unread"
             
-            results = self.service.users().messages().list(
+            results = self.execute(self.service.users().messages().list(
                 userId='me',
                 q=query,
                 maxResults=max_results
-            ).execute()
+            ))
             
             messages = results.get('messages', [])
             
-            email_list = []
-            for msg in messages:
-                email_data = self._parse_email(msg['id'])
-                
-                # Filter for recruiter emails (basic heuristics)
-                if self._is_likely_recruiter(email_data):
-                    email_list.append(email_data)
-            
-            return email_list
+            return self.get_recruiter_emails([msg['id'] for msg in messages])
             
         except HttpError as error:
             print(f"Gmail API error: {error}")
             return []
     
+    def get_recruiter_emails(self, msg_ids: List[str], unread_only: bool = True) -> List[Dict]:
+        """Fetch and parse the given emails, keeping those that look like recruiter emails"""
+        email_list = []
+        for msg_id in msg_ids:
+            email_data = self._parse_email(msg_id)
+            
+            if unread_only and 'UNREAD' not in email_data.get('labels', []):
+                continue
+            
+            # Filter for recruiter emails (basic heuristics)
+            if self._is_likely_recruiter(email_data):
+                email_list.append(email_data)
+        
+        return email_list
+    
+    def get_current_history_id(self) -> Optional[str]:
+        """Latest mailbox history ID, used as the starting point for list_new_message_ids"""
+        try:
+            profile = self.execute(self.service.users().getProfile(userId='me'))
+            return profile.get('historyId')
+        except HttpError as error:
+            print(f"Error getting mailbox profile: {error}")
+            return None
+    
+    def list_new_message_ids(self, since_history_id: str) -> Optional[Tuple[List[str], str]]:
+        """
+        List emails added to the inbox since a history ID
+        
+        Returns:
+            (message IDs, latest history ID), or None when the history ID has
+            expired and a full scan is needed
+        """
+        message_ids = []
+        page_token = None
+        
+        try:
+            while True:
+                results = self.execute(self.service.users().history().list(
+                    userId='me',
+                    startHistoryId=since_history_id,
+                    historyTypes=['messageAdded'],
+                    labelId='INBOX',
+                    pageToken=page_token
+                ))
+                
+                for record in results.get('history', []):
+                    for added in record.get('messagesAdded', []):
+                        message_ids.append(added['message']['id'])
+                
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    # dict.fromkeys drops duplicates but keeps arrival order
+                    return list(dict.fromkeys(message_ids)), results.get('historyId', since_history_id)
+            
+        except HttpError as error:
+            if error.resp.status == 404:
+                return None
+            print(f"Gmail history error: {error}")
+            return [], since_history_id
+    
     def _parse_email(self, msg_id: str) -> Dict:
         """Parse email message and extract relevant data"""
         try:
-            message = self.service.users().messages().get(
+            message = self.execute(self.service.users().messages().get(
                 userId='me',
                 id=msg_id,
                 format='full'
-            ).execute()
+            ))
             
             headers = message['payload']['headers']
             
@@ -281,10 +366,10 @@ class EmailAgent:
                 'threadId': thread_id
             }
             
-            result = self.service.users().messages().send(
+            result = self.execute_write(self.service.users().messages().send(
                 userId='me',
                 body=send_message
-            ).execute()
+            ))
             
             print(f"Email sent successfully. Message ID: {result['id']}")
             return True
@@ -296,11 +381,11 @@ class EmailAgent:
     def mark_as_read(self, msg_id: str):
         """Mark an email as read"""
         try:
-            self.service.users().messages().modify(
+            self.execute_write(self.service.users().messages().modify(
                 userId='me',
                 id=msg_id,
                 body={'removeLabelIds': ['UNREAD']}
-            ).execute()
+            ))
         except HttpError as error:
             print(f"Error marking email as read: {error}")
     
@@ -311,19 +396,56 @@ class EmailAgent:
             label_id = self._get_or_create_label(label_name)
             
             if label_id:
-                self.service.users().messages().modify(
+                self.execute_write(self.service.users().messages().modify(
                     userId='me',
                     id=msg_id,
                     body={'addLabelIds': [label_id]}
-                ).execute()
+                ))
         except HttpError as error:
             print(f"Error adding label: {error}")
     
+    def batch_modify(self, ids: List[str], add_labels: Optional[List[str]] = None,
+                     remove_labels: Optional[List[str]] = None):
+        """
+        Add/remove labels on many emails with batchModify
+        
+        Args:
+            ids: Gmail message IDs
+            add_labels: Label names to add (created if missing)
+            remove_labels: Label names to remove, e.g. 'UNREAD'
+        """
+        if not ids or not (add_labels or remove_labels):
+            return
+        
+        try:
+            body = {}
+            if add_labels:
+                body['addLabelIds'] = self._resolve_label_ids(add_labels)
+            if remove_labels:
+                body['removeLabelIds'] = self._resolve_label_ids(remove_labels)
+            
+            for start in range(0, len(ids), self.BATCH_MODIFY_LIMIT):
+                self.execute_write(self.service.users().messages().batchModify(
+                    userId='me',
+                    body={'ids': ids[start:start + self.BATCH_MODIFY_LIMIT], **body}
+                ))
+        except HttpError as error:
+            print(f"Error modifying emails: {error}")
+    
+    def _resolve_label_ids(self, label_names: List[str]) -> List[str]:
+        """Map label names to IDs, passing system labels through"""
+        label_ids = []
+        for name in label_names:
+            label_id = name if name in self.SYSTEM_LABELS else self._get_or_create_label(name)
+            if label_id:
+                label_ids.append(label_id)
+        return label_ids
+    
     def _get_or_create_label(self, label_name: str) -> Optional[str]:
         """Get label ID or create if doesn't exist"""
         try:
             # Get all labels
-            results = self.service.users().labels().list(userId='me').execute()
+            results = self.execute(self.service.users().labels().list(userId='me'))
             labels = results.get('labels', [])
             
             # Check if label exists
@@ -338,10 +460,10 @@ class EmailAgent:
                 'messageListVisibility': 'show'
             }
             
-            created_label = self.service.users().labels().create(
+            created_label = self.execute_write(self.service.users().labels().create(
                 userId='me',
                 body=label_object
-            ).execute()
+            ))
             
             return created_label['id']
             
@@ -352,10 +474,10 @@ class EmailAgent:
     def get_thread_messages(self, thread_id: str) -> List[Dict]:
         """Get all messages in a thread"""
         try:
-            thread = self.service.users().threads().get(
+            thread = self.execute(self.service.users().threads().get(
                 userId='me',
                 id=thread_id
-            ).execute()
+            ))
             
             messages = []
             for msg in thread['messages']:
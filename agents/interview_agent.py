@@ -1,25 +1,179 @@
 """Interview agent for ARIA - handles automated interview interactions."""
 
-import time
+from __future__ import annotations
+
+import os
 import re
+import asyncio
+import json
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
+from urllib.parse import urlparse
+
+from utils.response_cache import shared_cache
 
 logger = logging.getLogger(__name__)
 
 try:
-    from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
-    PLAYWRIGHT_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-    logger.warning("Playwright not installed. Browser automation will not work.")
+    AHOCORASICK_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, Browser, BrowserContext, Locator
+
+# Playwright is imported on first browser start, not at module load;
+# playwright.sync_api once imported, False if it isn't installed
+_playwright_api = None
+
+
+class PlaywrightTimeoutError(Exception):
+    """Placeholder rebound to playwright's TimeoutError once it is imported."""
+
+
+def _ensure_playwright():
+    """Import playwright.sync_api on first use; returns None if unavailable."""
+    global _playwright_api, PlaywrightTimeoutError
+    
+    if _playwright_api is None:
+        try:
+            from playwright import sync_api
+            _playwright_api = sync_api
+            PlaywrightTimeoutError = sync_api.TimeoutError
+        except ImportError:
+            _playwright_api = False
+            logger.warning("Playwright not installed. Browser automation will not work.")
+    
+    return _playwright_api or None
+
+
+# Options for every browser context the agent opens
+_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+}
+
+# Saved cookies/local storage per interview domain, reused by later sessions
+STORAGE_STATE_DIR = ".aria_state"
+
+# Distinct (tag, text) elements included in a page snapshot; the cap is applied
+# in the browser so no more than this many ever cross the driver connection
+MAX_PAGE_ELEMENTS = 100
+
+# Walks the DOM inside the browser so a page snapshot costs a single driver
+# round-trip instead of several per element.
+_PAGE_SNAPSHOT_JS = """
+(maxElements) => {
+    const elements = [];
+    const seen = new Set();
+    for (const el of document.querySelectorAll("p, h1, h2, h3, h4, h5, h6, div, span, button, input, textarea")) {
+        const text = (el.innerText || "").trim();
+        if (!text) continue;
+        const tag = el.tagName.toLowerCase();
+        const key = tag + "\\0" + text;
+        if (seen.has(key)) continue;
+        seen.add(key);
+        elements.push({tag: tag, text: text});
+        if (elements.length >= maxElements) break;
+    }
+
+    const inputs = [];
+    for (const el of document.querySelectorAll("input, textarea, select")) {
+        const type = el.getAttribute("type") || "text";
+        inputs.push({
+            type: type,
+            name: el.getAttribute("name") || "",
+            placeholder: el.getAttribute("placeholder") || "",
+            value: type !== "file" ? (el.value || "") : ""
+        });
+    }
+
+    const buttons = [];
+    for (const el of document.querySelectorAll("button, input[type='submit'], a[role='button']")) {
+        const text = el.innerText || el.getAttribute("aria-label") || "";
+        buttons.push(text.trim());
+    }
+
+    return {
+        text_content: document.body ? document.body.innerText : "",
+        elements: elements,
+        inputs: inputs,
+        buttons: buttons,
+        url: location.href
+    };
+}
+"""
+
+# Cheap page fingerprint used to decide whether a cached snapshot is stale.
+_PAGE_FINGERPRINT_JS = """
+() => [location.href, document.body ? document.body.innerHTML.length : 0, document.body ? document.body.childElementCount : 0]
+"""
+
+# Code blocks in page text, tried in order, and the markup stripped from a match
+_CODE_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (r'```[\s\S]*?```', r'<code>[\s\S]*?</code>', r'<pre>[\s\S]*?</pre>')
+]
+_CODE_MARKUP_RE = re.compile(r'```\w*|</?code>|</?pre>', re.IGNORECASE)
+
+# Snippets longer than this are reported as too long instead of being parsed
+MAX_ANALYZED_CODE_LENGTH = 20_000
+
+# Any of these (as substrings, case-insensitive) marks text as a likely question
+_QUESTION_RE = re.compile(r'question|what|how|why|explain|describe|\?', re.IGNORECASE)
+
+# Page keywords that trigger each planned action
+_PLAN_KEYWORDS = {
+    "code": ("code", "snippet", "function", "class"),
+    "question": ("question", "answer", "what", "how", "why"),
+    "start": ("start",),
+    "next": ("next",),
+}
+_PLAN_KEYWORD_CATEGORY = {word: category for category, words in _PLAN_KEYWORDS.items() for word in words}
+
+if AHOCORASICK_AVAILABLE:
+    _plan_automaton = ahocorasick.Automaton()
+    for _word, _category in _PLAN_KEYWORD_CATEGORY.items():
+        _plan_automaton.add_word(_word, _category)
+    _plan_automaton.make_automaton()
+else:
+    # Lookahead so overlapping keywords are all reported, like the automaton does
+    _PLAN_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _PLAN_KEYWORD_CATEGORY)) + "))")
+
+
+def _find_plan_keywords(text: str) -> set:
+    """Categories of _PLAN_KEYWORDS occurring in (lowercased) text, in one pass."""
+    if AHOCORASICK_AVAILABLE:
+        matches = (category for _, category in _plan_automaton.iter(text))
+    else:
+        matches = (_PLAN_KEYWORD_CATEGORY[m.group(1)] for m in _PLAN_KEYWORD_RE.finditer(text))
+    
+    found = set()
+    for category in matches:
+        found.add(category)
+        if category == "code":
+            break  # highest priority; nothing else can change the plan
+    return found
 
 
 class InterviewAgent:
     """Agent for automating interactions with HR interview systems."""
     
-    def __init__(self, llm_processor=None, state_manager=None, headless: bool = False):
+    # One Chromium process is shared by all agents in the process; every
+    # interview gets its own BrowserContext. Playwright's sync API is bound to
+    # the thread that started it, so agents must be driven from that thread.
+    _shared_playwright = None
+    _shared_browser = None
+    _browser_refcount = 0
+    _browser_lock = threading.Lock()
+    
+    def __init__(self, llm_processor=None, state_manager=None, headless: bool = False,
+                 answer_cache_path: Optional[str] = "data/aria_answers.db",
+                 answer_similarity_threshold: Optional[float] = None):
         """
         Initialize interview agent.
         
@@ -27,11 +181,19 @@ class InterviewAgent:
             llm_processor: ARIA's LLM processor instance
             state_manager: ARIA's state manager for conversation tracking
             headless: Whether to run browser in headless mode
+            answer_cache_path: Shelve file for persisting generated answers (None keeps them in memory)
+            answer_similarity_threshold: Cosine similarity at which a differently worded question
+                reuses a cached answer (None only reuses answers to the same question)
         """
         self.llm_processor = llm_processor
         self.state_manager = state_manager
         self.headless = headless
         
+        # Answers to previously seen questions, keyed by the normalized question text;
+        # agents using the same file share one cache
+        self._answer_cache = shared_cache(answer_cache_path,
+                                          similarity_threshold=answer_similarity_threshold)
+        
         # Browser automation
         self.playwright = None
         self.browser: Optional[Browser] = None
@@ -39,6 +201,12 @@ class InterviewAgent:
         self.page: Optional[Page] = None
         self.is_active = False
         
+        # (fingerprint, content) of the last page snapshot
+        self._page_content_cache: Optional[Tuple[Any, Dict[str, Any]]] = None
+        # SHA-256 of the last snapshot handed out, and the plan made for it
+        self._last_dom_hash: Optional[str] = None
+        self._last_plan: Optional[Tuple[str, Dict[str, Any]]] = None
+        
         # Interview state
         self.interview_state = {
             "current_step": None,
@@ -64,7 +232,7 @@ class InterviewAgent:
         """
         try:
             # Start browser
-            if not self._start_browser():
+            if not self._start_browser(interview_url):
                 return {"success": False, "error": "Failed to start browser"}
             
             # Navigate to interview URL
@@ -149,6 +317,21 @@ class InterviewAgent:
             "formatted_report": self._format_analysis_report(analysis)
         }
     
+    def _cached_answer(self, cache_key: str, question: str) -> Optional[str]:
+        """Previously generated answer for the question, or None (a failing cache is a miss)"""
+        try:
+            return self._answer_cache.get(cache_key, text=question)
+        except Exception as e:
+            logger.warning(f"Answer cache lookup failed: {e}")
+            return None
+    
+    def _cache_answer(self, cache_key: str, answer: str, question: str):
+        """Remember an answer; a failing cache is logged and otherwise ignored"""
+        try:
+            self._answer_cache.put(cache_key, answer, text=question)
+        except Exception as e:
+            logger.warning(f"Answer cache write failed: {e}")
+    
     def answer_question(self, question: Optional[str] = None) -> Dict[str, Any]:
         """
         Answer a question from the interview.
@@ -169,16 +352,24 @@ class InterviewAgent:
         
         # Generate answer using ARIA's LLM processor
         if self.llm_processor:
+            # Use ARIA's prompt system
+            prompt = self._build_interview_answer_prompt(question)
+            
+            # Case, spacing and trailing punctuation differences still hit the same answer
+            normalized = " ".join(question.lower().split()).rstrip("?.! ")
+            cache_key = hashlib.sha256(normalized.encode()).hexdigest()
+            
             try:
-                # Use ARIA's prompt system
-                prompt = self._build_interview_answer_prompt(question)
-                response_data = self.llm_processor.generate_response(
-                    message=prompt,
-                    channel='interview',
-                    conversation_state={},
-                    context={'question': question}
-                )
-                answer = response_data.get('response', '') if isinstance(response_data, dict) else str(response_data)
+                answer = self._cached_answer(cache_key, question)
+                if answer is None:
+                    response_data = self.llm_processor.generate_response(
+                        message=prompt,
+                        channel='interview',
+                        conversation_state={},
+                        context={'question': question}
+                    )
+                    answer = response_data.get('response', '') if isinstance(response_data, dict) else str(response_data)
+                    self._cache_answer(cache_key, answer, question)
             except Exception as e:
                 logger.error(f"LLM answer generation failed: {e}")
                 answer = "I would approach this by analyzing the requirements and implementing a solution that follows best practices."
@@ -223,10 +414,20 @@ class InterviewAgent:
                 
                 selector = self._find_element_by_text(target)
                 if selector:
+                    previous_hash = self._last_dom_hash
                     success = self._click_element(selector)
                     if success:
-                        time.sleep(2)  # Wait for page update
+                        try:
+                            self.page.wait_for_load_state("domcontentloaded", timeout=2000)
+                        except PlaywrightTimeoutError:
+                            pass
                         page_content = self._get_page_content()
+                        if previous_hash and page_content.get("_hash") == previous_hash:
+                            return {
+                                "success": True,
+                                "action": "unchanged",
+                                "page_content": page_content
+                            }
                         return {
                             "success": True,
                             "action": f"Clicked {target}",
@@ -256,8 +457,8 @@ class InterviewAgent:
                     success = self._wait_for_text(target, timeout=10000)
                     return {"success": success, "action": f"Waited for {target}"}
                 else:
-                    time.sleep(2)
-                    return {"success": True, "action": "Waited 2 seconds"}
+                    self._wait_for_page_load()
+                    return {"success": True, "action": "Waited for page to load"}
             
             else:
                 return {"success": False, "error": f"Unknown action: {action}"}
@@ -265,9 +466,61 @@ class InterviewAgent:
             logger.error(f"Error interacting with page: {e}")
             return {"success": False, "error": str(e)}
     
+    def batch_actions(self, steps: List[Dict[str, Any]], continue_on_error: bool = True) -> Dict[str, Any]:
+        """
+        Perform several page actions and snapshot the page once at the end.
+        
+        Unlike repeated interact_with_page calls, no page content is scraped
+        between steps; fill targets are matched with a CSS selector instead.
+        
+        Args:
+            steps: Actions as {"action": "click"|"fill"|"wait", "target": ..., "value": ...}
+            continue_on_error: Keep going after a failed step (otherwise stop there)
+        
+        Returns:
+            Per-step results, the final page content and the planned next action
+        """
+        results = []
+        for step in steps:
+            action = step.get("action")
+            target = step.get("target")
+            value = step.get("value")
+            
+            try:
+                if action == "click":
+                    selector = self._find_element_by_text(target) if target else None
+                    success = bool(selector) and self._click_element(selector)
+                elif action == "fill":
+                    success = bool(target and value) and self._fill_input(self._input_selector_for(target), value)
+                elif action == "wait":
+                    success = self._wait_for_text(target) if target else self._wait_for_page_load()
+                else:
+                    results.append({"action": action, "target": target, "success": False,
+                                    "error": f"Unknown action: {action}"})
+                    if not continue_on_error:
+                        break
+                    continue
+            except Exception as e:
+                logger.error(f"Batch step {action} {target} failed: {e}")
+                success = False
+            
+            results.append({"action": action, "target": target, "success": success})
+            if not success and not continue_on_error:
+                break
+        
+        self._invalidate_page_content()
+        final_page = self._get_page_content()
+        
+        return {
+            "success": all(r["success"] for r in results),
+            "results": results,
+            "final_page": final_page,
+            "next_action": self._analyze_page_and_plan(final_page)
+        }
+    
     def get_interview_status(self) -> Dict[str, Any]:
         """Get current interview status."""
-        page_content = self._get_page_content() if self.is_active else {}
+        page_url = self._get_page_url()
         
         return {
             "active": self.is_active,
@@ -276,7 +529,7 @@ class InterviewAgent:
             "position": self.interview_state.get("position"),
             "questions_answered": len(self.interview_state["questions_answered"]),
             "code_snippets_analyzed": len(self.interview_state["code_snippets_analyzed"]),
-            "page_url": page_content.get("url", "N/A"),
+            "page_url": page_url,
             "started_at": self.interview_state.get("started_at"),
         }
     
@@ -294,131 +547,195 @@ class InterviewAgent:
         }
     
     # Browser automation methods
-    def _start_browser(self) -> bool:
-        """Start browser session."""
-        if not PLAYWRIGHT_AVAILABLE:
+    def _start_browser(self, url: Optional[str] = None) -> bool:
+        """Start browser session in a fresh context on the shared browser.
+        
+        If cookies/storage were saved for the URL's domain by a previous
+        session, the context is created from them so logins carry over.
+        """
+        if not _ensure_playwright():
             logger.error("Playwright not available. Install with: pip install playwright && playwright install")
             return False
         
+        if self.is_active:
+            return True
+        
         try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(headless=self.headless)
-            self.context = self.browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
+            self._acquire_shared_browser()
+        except Exception as e:
+            logger.error(f"Failed to start browser: {e}")
+            return False
+        
+        try:
+            context_options = dict(_CONTEXT_OPTIONS)
+            state_path = self._storage_state_path(url)
+            if state_path and os.path.exists(state_path):
+                context_options["storage_state"] = state_path
+                logger.info(f"Reusing saved browser state from {state_path}")
+            self.context = self.browser.new_context(**context_options)
             self.page = self.context.new_page()
             self.is_active = True
             logger.info("Browser started successfully")
             return True
         except Exception as e:
             logger.error(f"Failed to start browser: {e}")
+            self._release_shared_browser()
             return False
     
+    def _storage_state_path(self, url: Optional[str]) -> Optional[str]:
+        """Path of the saved storage state for a URL's domain."""
+        if not url:
+            return None
+        domain = urlparse(url).hostname
+        if not domain:
+            return None
+        return os.path.join(STORAGE_STATE_DIR, f"{domain}.json")
+    
+    def _save_storage_state(self):
+        """Persist cookies/local storage of the current context for its domain."""
+        state_path = self._storage_state_path(self.interview_state.get("interview_url"))
+        if not state_path:
+            return
+        
+        try:
+            os.makedirs(STORAGE_STATE_DIR, exist_ok=True)
+            self.context.storage_state(path=state_path)
+        except Exception as e:
+            logger.warning(f"Could not save browser state to {state_path}: {e}")
+    
+    def _acquire_shared_browser(self):
+        """Launch the shared browser on first use and take a reference to it."""
+        with InterviewAgent._browser_lock:
+            if InterviewAgent._shared_browser is None:
+                playwright = _ensure_playwright().sync_playwright().start()
+                try:
+                    InterviewAgent._shared_browser = playwright.chromium.launch(headless=self.headless)
+                except Exception:
+                    playwright.stop()
+                    raise
+                InterviewAgent._shared_playwright = playwright
+            InterviewAgent._browser_refcount += 1
+            self.playwright = InterviewAgent._shared_playwright
+            self.browser = InterviewAgent._shared_browser
+    
+    def _release_shared_browser(self):
+        """Drop this agent's reference and shut the browser down after the last one."""
+        with InterviewAgent._browser_lock:
+            if self.browser is None:
+                return
+            self.playwright = None
+            self.browser = None
+            InterviewAgent._browser_refcount -= 1
+            if InterviewAgent._browser_refcount > 0:
+                return
+            
+            browser, playwright = InterviewAgent._shared_browser, InterviewAgent._shared_playwright
+            InterviewAgent._shared_browser = None
+            InterviewAgent._shared_playwright = None
+            try:
+                browser.close()
+            finally:
+                playwright.stop()
+    
     def _navigate_to(self, url: str) -> bool:
         """Navigate to a URL."""
         if not self.is_active or not self.page:
             logger.error("Browser not started")
             return False
         
+        self._invalidate_page_content()
         try:
-            self.page.goto(url, wait_until="networkidle", timeout=30000)
+            self.page.goto(url, wait_until="domcontentloaded", timeout=15000)
+            self._wait_for_network_idle()
             logger.info(f"Navigated to {url}")
             return True
         except Exception as e:
             logger.error(f"Failed to navigate to {url}: {e}")
             return False
     
+    def _wait_for_network_idle(self, timeout: int = 1500):
+        """Give the page a short, bounded chance to go network-idle."""
+        try:
+            self.page.wait_for_load_state("networkidle", timeout=timeout)
+        except PlaywrightTimeoutError:
+            pass
+    
+    def _wait_for_page_load(self, timeout: int = 2000) -> bool:
+        """Wait (bounded) until the document reports it has finished loading."""
+        if not self.is_active or not self.page:
+            return False
+        
+        try:
+            self.page.wait_for_function("() => document.readyState === 'complete'", timeout=timeout)
+        except PlaywrightTimeoutError:
+            pass
+        return True
+    
+    def _get_page_url(self) -> str:
+        """Current page URL without scraping the DOM."""
+        return self.page.url if (self.is_active and self.page) else "N/A"
+    
     def _get_page_content(self) -> Dict[str, Any]:
         """Extract text content and structure from current page."""
         if not self.is_active or not self.page:
             return {"error": "Browser not started"}
         
         try:
-            text_content = self.page.inner_text("body")
+            fingerprint = self.page.evaluate(_PAGE_FINGERPRINT_JS)
+            if self._page_content_cache and self._page_content_cache[0] == fingerprint:
+                content = self._page_content_cache[1]
+                self._last_dom_hash = content["_hash"]
+                return content
             
-            elements = self.page.query_selector_all("p, h1, h2, h3, h4, h5, h6, div, span, button, input, textarea")
-            element_texts = []
-            for elem in elements[:100]:
-                try:
-                    text = elem.inner_text()
-                    tag = elem.evaluate("el => el.tagName.toLowerCase()")
-                    if text.strip():
-                        element_texts.append({"tag": tag, "text": text.strip()})
-                except:
-                    continue
-            
-            inputs = []
-            for input_elem in self.page.query_selector_all("input, textarea, select"):
-                try:
-                    input_type = input_elem.get_attribute("type") or "text"
-                    placeholder = input_elem.get_attribute("placeholder") or ""
-                    name = input_elem.get_attribute("name") or ""
-                    value = input_elem.input_value() if input_type != "file" else ""
-                    inputs.append({
-                        "type": input_type,
-                        "name": name,
-                        "placeholder": placeholder,
-                        "value": value
-                    })
-                except:
-                    continue
-            
-            buttons = []
-            for button in self.page.query_selector_all("button, input[type='submit'], a[role='button']"):
-                try:
-                    text = button.inner_text() or button.get_attribute("aria-label") or ""
-                    buttons.append(text.strip())
-                except:
-                    continue
-            
-            return {
-                "text_content": text_content,
-                "elements": element_texts,
-                "inputs": inputs,
-                "buttons": buttons,
-                "url": self.page.url
+            snapshot = self.page.evaluate(_PAGE_SNAPSHOT_JS, MAX_PAGE_ELEMENTS)
+            content = {
+                "text_content": snapshot["text_content"],
+                "elements": snapshot["elements"],
+                "inputs": snapshot["inputs"],
+                "buttons": snapshot["buttons"],
+                "url": snapshot["url"]
             }
+            content["_hash"] = hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+            self._page_content_cache = (fingerprint, content)
+            self._last_dom_hash = content["_hash"]
+            return content
         except Exception as e:
             logger.error(f"Failed to get page content: {e}")
             return {"error": str(e)}
     
-    def _find_element_by_text(self, text: str, partial: bool = True) -> Optional[str]:
-        """Find element containing text and return selector."""
+    def _invalidate_page_content(self):
+        """Drop the cached page snapshot after an action that may change the DOM."""
+        self._page_content_cache = None
+    
+    def _find_element_by_text(self, text: str, partial: bool = True) -> Optional["Locator"]:
+        """Find the first element containing text and return a locator for it."""
         if not self.is_active or not self.page:
             return None
         
         try:
-            if partial:
-                selector = f"text={text}"
-            else:
-                selector = f"text='{text}'"
-            
-            element = self.page.query_selector(selector)
-            if element:
-                try:
-                    id_attr = element.get_attribute("id")
-                    if id_attr:
-                        return f"#{id_attr}"
-                    class_attr = element.get_attribute("class")
-                    if class_attr:
-                        return f".{class_attr.split()[0]}"
-                    return selector
-                except:
-                    return selector
-            return None
+            locator = self.page.get_by_text(text, exact=not partial).first
+            return locator if locator.count() else None
         except Exception as e:
             logger.error(f"Failed to find element: {e}")
             return None
     
-    def _click_element(self, selector: str) -> bool:
-        """Click an element by selector."""
+    def _input_selector_for(self, target: str) -> str:
+        """CSS selector for inputs whose name or placeholder contains target (case-insensitive)."""
+        escaped = target.replace("\\", "\\\\").replace('"', '\\"')
+        return f'input[name*="{escaped}" i], input[placeholder*="{escaped}" i]'
+    
+    def _click_element(self, selector: Union[str, "Locator"]) -> bool:
+        """Click an element by selector or locator."""
         if not self.is_active or not self.page:
             return False
         
+        self._invalidate_page_content()
         try:
-            self.page.click(selector, timeout=5000)
-            time.sleep(1)
+            if isinstance(selector, str):
+                self.page.click(selector, timeout=5000)
+            else:
+                selector.click(timeout=5000)
+            self._wait_for_network_idle()
             logger.info(f"Clicked element: {selector}")
             return True
         except Exception as e:
@@ -430,6 +747,7 @@ class InterviewAgent:
         if not self.is_active or not self.page:
             return False
         
+        self._invalidate_page_content()
         try:
             self.page.fill(selector, text)
             logger.info(f"Filled input {selector} with text")
@@ -453,12 +771,15 @@ class InterviewAgent:
         """Close browser session."""
         try:
             if self.context:
+                self._save_storage_state()
                 self.context.close()
-            if self.browser:
-                self.browser.close()
-            if self.playwright:
-                self.playwright.stop()
+            self.context = None
+            self.page = None
             self.is_active = False
+            self._release_shared_browser()
+            self._invalidate_page_content()
+            self._last_dom_hash = None
+            self._last_plan = None
             logger.info("Browser closed")
         except Exception as e:
             logger.error(f"Error closing browser: {e}")
@@ -466,16 +787,28 @@ class InterviewAgent:
     # Analysis methods
     def _analyze_page_and_plan(self, page_content: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze page content and determine next action."""
+        dom_hash = page_content.get("_hash")
+        if dom_hash and self._last_plan and self._last_plan[0] == dom_hash:
+            return self._last_plan[1]
+        
+        plan = self._plan_next_action(page_content)
+        if dom_hash:
+            self._last_plan = (dom_hash, plan)
+        return plan
+    
+    def _plan_next_action(self, page_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Decide the next action from page text and buttons."""
         text = page_content.get("text_content", "").lower()
         buttons = page_content.get("buttons", [])
+        found = _find_plan_keywords(text)
         
-        if any(word in text for word in ["code", "snippet", "function", "class"]):
+        if "code" in found:
             return {"action": "analyze_code", "reasoning": "Code snippet detected on page"}
-        elif any(word in text for word in ["question", "answer", "what", "how", "why"]):
+        elif "question" in found:
             return {"action": "answer_question", "reasoning": "Question detected on page"}
-        elif "start" in text or any("start" in b.lower() for b in buttons):
+        elif "start" in found or any("start" in b.lower() for b in buttons):
             return {"action": "click", "target": "start", "reasoning": "Start button found"}
-        elif "next" in text or any("next" in b.lower() for b in buttons):
+        elif "next" in found or any("next" in b.lower() for b in buttons):
             return {"action": "click", "target": "next", "reasoning": "Next button found"}
         else:
             return {"action": "analyze", "reasoning": "Analyzing page structure"}
@@ -485,23 +818,10 @@ class InterviewAgent:
         text = page_content.get("text_content", "")
         elements = page_content.get("elements", [])
         
-        code_patterns = [
-            r'```[\s\S]*?```',
-            r'<code>[\s\S]*?</code>',
-            r'<pre>[\s\S]*?</pre>'
-        ]
-        
-        for pattern in code_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                code = matches[0]
-                code = re.sub(r'```\w*', '', code)
-                code = re.sub(r'```', '', code)
-                code = re.sub(r'<code>', '', code, flags=re.IGNORECASE)
-                code = re.sub(r'</code>', '', code, flags=re.IGNORECASE)
-                code = re.sub(r'<pre>', '', code, flags=re.IGNORECASE)
-                code = re.sub(r'</pre>', '', code, flags=re.IGNORECASE)
-                return code.strip()
+        for pattern in _CODE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return _CODE_MARKUP_RE.sub('', match.group(0)).strip()
         
         for elem in elements:
             if elem.get("tag") in ["code", "pre"]:
@@ -516,19 +836,15 @@ class InterviewAgent:
         text = page_content.get("text_content", "")
         elements = page_content.get("elements", [])
         
-        question_keywords = ["question", "what", "how", "why", "explain", "describe", "?"]
-        
         for elem in elements:
             elem_text = elem.get("text", "")
-            if any(keyword in elem_text.lower() for keyword in question_keywords):
-                if "?" in elem_text or len(elem_text) > 20:
-                    return elem_text
+            if ("?" in elem_text or len(elem_text) > 20) and _QUESTION_RE.search(elem_text):
+                return elem_text
         
-        sentences = text.split('.')
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in question_keywords):
-                if "?" in sentence:
-                    return sentence.strip()
+        # "?" is itself a question marker, so it is the only check needed here
+        for sentence in text.split('.'):
+            if "?" in sentence:
+                return sentence.strip()
         
         return None
     
@@ -536,11 +852,25 @@ class InterviewAgent:
         """Analyze code for issues (simplified version)."""
         issues = []
         
+        # Don't parse arbitrarily large pastes; the size alone is the finding
+        if len(code) > MAX_ANALYZED_CODE_LENGTH:
+            issues.append({
+                "type": "code_smell",
+                "severity": "medium",
+                "message": f"Snippet too long to analyze ({len(code)} characters)."
+            })
+            return {
+                "issues": issues,
+                "quality_score": max(0, 100 - (len(issues) * 10)),
+                "language": language,
+                "code_length": len(code)
+            }
+        
         # Basic syntax checking for Python
         if language.lower() == "python":
             try:
                 import ast
-                ast.parse(code)
+                compile(code, "<snippet>", "exec", flags=ast.PyCF_ONLY_AST)
             except SyntaxError as e:
                 issues.append({
                     "type": "syntax_error",
@@ -548,6 +878,12 @@ class InterviewAgent:
                     "message": f"Syntax error: {e.msg} at line {e.lineno}",
                     "line": e.lineno
                 })
+            except (ValueError, MemoryError) as e:
+                issues.append({
+                    "type": "syntax_error",
+                    "severity": "high",
+                    "message": f"Code could not be parsed: {e}"
+                })
         
         # Basic code smell detection
         lines = code.split('\n')
@@ -578,40 +914,38 @@ class InterviewAgent:
         high_severity = [i for i in issues if i.get("severity") == "high"]
         medium_severity = [i for i in issues if i.get("severity") == "medium"]
         
-        response_parts = []
-        
+        crit_section = ""
         if high_severity:
-            response_parts.append(f"I found {len(high_severity)} critical issue(s):")
-            for issue in high_severity[:3]:
-                response_parts.append(f"- {issue.get('message', 'Issue found')}")
+            crit_lines = "\n".join(f"- {issue.get('message', 'Issue found')}" for issue in high_severity[:3])
+            crit_section = f"I found {len(high_severity)} critical issue(s):\n{crit_lines}\n"
         
+        mid_section = ""
         if medium_severity:
-            response_parts.append(f"\nThere are also {len(medium_severity)} issue(s) to consider:")
-            for issue in medium_severity[:2]:
-                response_parts.append(f"- {issue.get('message', 'Issue found')}")
+            mid_lines = "\n".join(f"- {issue.get('message', 'Issue found')}" for issue in medium_severity[:2])
+            mid_section = f"\nThere are also {len(medium_severity)} issue(s) to consider:\n{mid_lines}\n"
         
-        response_parts.append(f"\nOverall quality score: {quality_score}/100")
-        
-        return "\n".join(response_parts)
+        return f"{crit_section}{mid_section}\nOverall quality score: {quality_score}/100"
     
     def _format_analysis_report(self, analysis: Dict[str, Any]) -> str:
         """Format analysis results as a readable report."""
-        report = f"Code Analysis Report\n"
-        report += f"{'='*50}\n"
-        report += f"Language: {analysis.get('language', 'unknown')}\n"
-        report += f"Quality Score: {analysis.get('quality_score', 0)}/100\n\n"
+        lines = [
+            "Code Analysis Report\n",
+            f"{'='*50}\n",
+            f"Language: {analysis.get('language', 'unknown')}\n",
+            f"Quality Score: {analysis.get('quality_score', 0)}/100\n\n",
+        ]
         
         issues = analysis.get('issues', [])
         if issues:
-            report += f"Issues Found ({len(issues)}):\n"
+            lines.append(f"Issues Found ({len(issues)}):\n")
             for i, issue in enumerate(issues, 1):
                 severity = issue.get('severity', 'unknown').upper()
                 message = issue.get('message', 'No description')
-                report += f"{i}. [{severity}] {message}\n"
+                lines.append(f"{i}. [{severity}] {message}\n")
         else:
-            report += "No issues found!\n"
+            lines.append("No issues found!\n")
         
-        return report
+        return "".join(lines)
     
     def _build_interview_answer_prompt(self, question: str) -> str:
         """Build prompt for answering interview questions."""
@@ -621,3 +955,51 @@ Question: {question}
 
 Provide a clear, technical answer that demonstrates your knowledge. Keep it to 2-3 sentences unless the question requires more detail."""
 
+
+async def snapshot_pages_async(urls: List[str], headless: bool = True) -> List[Dict[str, Any]]:
+    """
+    Open several pages concurrently and return a content snapshot for each.
+    
+    Uses Playwright's async API so navigation and DOM extraction for all tabs
+    overlap instead of running one after another.
+    
+    Args:
+        urls: Pages to open, each in its own tab of one browser context
+        headless: Whether to run browser in headless mode
+    
+    Returns:
+        Snapshots in the same order as urls ({"url": ..., "error": ...} for pages that failed)
+    """
+    try:
+        from playwright.async_api import async_playwright
+        from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+    except ImportError:
+        raise ImportError("Playwright not installed. Run: pip install playwright && playwright install")
+    
+    async def snapshot(context, url: str) -> Dict[str, Any]:
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+            try:
+                await page.wait_for_load_state("networkidle", timeout=1500)
+            except AsyncPlaywrightTimeoutError:
+                pass
+            return await page.evaluate(_PAGE_SNAPSHOT_JS, MAX_PAGE_ELEMENTS)
+        except Exception as e:
+            logger.error(f"Failed to snapshot {url}: {e}")
+            return {"url": url, "error": str(e)}
+        finally:
+            await page.close()
+    
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless)
+        try:
+            context = await browser.new_context(**_CONTEXT_OPTIONS)
+            return list(await asyncio.gather(*(snapshot(context, url) for url in urls)))
+        finally:
+            await browser.close()
+
+
+def snapshot_pages(urls: List[str], headless: bool = True) -> List[Dict[str, Any]]:
+    """Synchronous wrapper around snapshot_pages_async for non-async callers."""
+    return asyncio.run(snapshot_pages_async(urls, headless=headless))
@@ -33,6 +33,9 @@ class SMSAgent:
         'google-fi': '@msg.fi.google.com',
     }
     
+    # Gateway domains as a tuple so str.endswith() can check them all in one call
+    GATEWAY_SUFFIXES = tuple(CARRIER_GATEWAYS.values())
+    
     def __init__(self, email_agent, default_gateway: str = '@txt.att.net'):
         """
         Initialize SMS agent
@@ -91,10 +94,10 @@ class SMSAgent:
             
             send_message = {'raw': raw_message}
             
-            result = self.email_agent.service.users().messages().send(
+            result = self.email_agent.execute_write(self.email_agent.service.users().messages().send(
                 userId='me',
                 body=send_message
-            ).execute()
+            ))
             
             print(f"SMS sent to {phone_number} via {gateway}")
             return True
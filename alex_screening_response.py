@@ -14,8 +14,11 @@ your_details = {
     'interview_availability': 'Flexible - evenings and weekends preferred'
 }
 
-# Generate response
-response = f"""Hi Alex,
+
+def main():
+    """Print ARIA's screening response and the notes that go with it"""
+    # Generate response
+    response = f"""Hi Alex,
 
 Thank you for following up. I'd be happy to provide the requested information.
 
@@ -65,50 +68,52 @@ ARIA (Automated Recruiter Interaction Assistant)
 Responding on behalf of Elena Mereanu
 """
 
-print("=" * 80)
-print("ARIA'S RESPONSE TO ALEX'S SCREENING QUESTIONS")
-print("=" * 80)
-print()
-print(response)
-print()
-print("=" * 80)
-print("KEY POINTS:")
-print("=" * 80)
-print("[+] Provides all requested information professionally")
-print("[+] Details technical experience with specific examples")
-print("[+] RE-EMPHASIZES the $65-75/hr requirement (important!)")
-print("[+] Asks for confirmation on rate before proceeding")
-print("[+] Maintains professional but firm stance on compensation")
-print("[+] ARIA disclosure included")
-print()
-print("=" * 80)
-print("STRATEGY:")
-print("=" * 80)
-print()
-print("Notice that Alex didn't address your rate concern in his response.")
-print("He's collecting info to 'get back with the most relevant opportunity.'")
-print()
-print("This could mean:")
-print("1. He's looking for other clients who can pay $65-75/hr")
-print("2. He's hoping you'll forget about the rate and accept $45-48")
-print("3. He needs your info to present to the client for rate negotiation")
-print()
-print("ARIA's response:")
-print("- Provides all the info he needs")
-print("- CLEARLY re-states the $65-75/hr requirement")
-print("- Asks him to confirm rate availability BEFORE interviews")
-print("- Saves your time if he can't meet the rate")
-print()
-print("=" * 80)
-print("UPDATE YOUR DETAILS:")
-print("=" * 80)
-print()
-print("Before sending, update these in the script:")
-print(f"  - current_location_zip: '{your_details['current_location_zip']}'")
-print(f"  - preferred_location_zip: '{your_details['preferred_location_zip']}'")
-print(f"  - interview_availability: '{your_details['interview_availability']}'")
-print()
-print("Then run: python alex_screening_response.py")
-print()
-
-
+    print("=" * 80)
+    print("ARIA'S RESPONSE TO ALEX'S SCREENING QUESTIONS")
+    print("=" * 80)
+    print()
+    print(response)
+    print()
+    print("=" * 80)
+    print("KEY POINTS:")
+    print("=" * 80)
+    print("[+] Provides all requested information professionally")
+    print("[+] Details technical experience with specific examples")
+    print("[+] RE-EMPHASIZES the $65-75/hr requirement (important!)")
+    print("[+] Asks for confirmation on rate before proceeding")
+    print("[+] Maintains professional but firm stance on compensation")
+    print("[+] ARIA disclosure included")
+    print()
+    print("=" * 80)
+    print("STRATEGY:")
+    print("=" * 80)
+    print()
+    print("Notice that Alex didn't address your rate concern in his response.")
+    print("He's collecting info to 'get back with the most relevant opportunity.'")
+    print()
+    print("This could mean:")
+    print("1. He's looking for other clients who can pay $65-75/hr")
+    print("2. He's hoping you'll forget about the rate and accept $45-48")
+    print("3. He needs your info to present to the client for rate negotiation")
+    print()
+    print("ARIA's response:")
+    print("- Provides all the info he needs")
+    print("- CLEARLY re-states the $65-75/hr requirement")
+    print("- Asks him to confirm rate availability BEFORE interviews")
+    print("- Saves your time if he can't meet the rate")
+    print()
+    print("=" * 80)
+    print("UPDATE YOUR DETAILS:")
+    print("=" * 80)
+    print()
+    print("Before sending, update these in the script:")
+    print(f"  - current_location_zip: '{your_details['current_location_zip']}'")
+    print(f"  - preferred_location_zip: '{your_details['preferred_location_zip']}'")
+    print(f"  - interview_availability: '{your_details['interview_availability']}'")
+    print()
+    print("Then run: python alex_screening_response.py")
+    print()
+
+
+if __name__ == "__main__":
+    main()
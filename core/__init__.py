@@ -2,9 +2,10 @@
 Core components for AI Recruiter Agent
 """
 
+from core.config import Config
 from core.orchestrator import JobApplicationOrchestrator
-from core.state_manager import StateManager, ConversationState
+from core.state_manager import StateManager, AsyncStateManager, ConversationState
 from core.llm_processor import LLMProcessor
 
-__all__ = ['JobApplicationOrchestrator', 'StateManager', 'ConversationState', 'LLMProcessor']
+__all__ = ['Config', 'JobApplicationOrchestrator', 'StateManager', 'AsyncStateManager', 'ConversationState', 'LLMProcessor']
 
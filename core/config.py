@@ -0,0 +1,51 @@
+"""
+Environment configuration for the AI Recruiter Agent
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _flag(value: str) -> bool:
+    return value.lower() == 'true'
+
+
+@dataclass(frozen=True)
+class Config:
+    """Settings read from the environment once at startup"""
+    database_path: str
+    llm_provider: str
+    ollama_model: str
+    gmail_credentials_path: str
+    gmail_token_path: str
+    sms_email_gateway: str
+    interview_headless: bool
+    auto_reply_enabled: bool
+    require_approval: bool
+    check_interval: int
+    email_workers: int
+    escalation_email: Optional[str]
+    answer_similarity_threshold: Optional[float]
+
+    @classmethod
+    def from_env(cls) -> 'Config':
+        """Build a Config from a single snapshot of os.environ (call after load_dotenv)"""
+        env = dict(os.environ)
+
+        return cls(
+            database_path=env.get('DATABASE_PATH', 'data/conversations.db'),
+            llm_provider=env.get('LLM_PROVIDER', 'ollama'),
+            ollama_model=env.get('OLLAMA_MODEL', 'llama2'),
+            gmail_credentials_path=env.get('GMAIL_CREDENTIALS_PATH', 'credentials/gmail_credentials.json'),
+            gmail_token_path=env.get('GMAIL_TOKEN_PATH', 'credentials/gmail_token.json'),
+            sms_email_gateway=env.get('SMS_EMAIL_GATEWAY', '@txt.att.net'),
+            interview_headless=_flag(env.get('INTERVIEW_HEADLESS', 'false')),
+            auto_reply_enabled=_flag(env.get('AUTO_REPLY_ENABLED', 'true')),
+            require_approval=_flag(env.get('REQUIRE_APPROVAL', 'false')),
+            check_interval=int(env.get('CHECK_INTERVAL_SECONDS', '300')),
+            email_workers=int(env.get('EMAIL_WORKERS', '4')),
+            escalation_email=env.get('ESCALATION_EMAIL'),
+            answer_similarity_threshold=(float(env['ANSWER_SIMILARITY_THRESHOLD'])
+                                         if env.get('ANSWER_SIMILARITY_THRESHOLD') else None),
+        )
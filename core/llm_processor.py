@@ -3,11 +3,15 @@ LLM Processor for generating responses using local or cloud LLMs
 """
 
 import os
+import copy
 import json
+import hashlib
 import yaml
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+from utils.response_cache import ResponseCache
+
 # Import LLM libraries
 try:
     import ollama
@@ -28,6 +32,13 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
 
 
+def _state_get(state: Any, name: str, default: Any = None) -> Any:
+    """Read a field from a ConversationState or a plain dict"""
+    if isinstance(state, dict):
+        return state.get(name, default)
+    return getattr(state, name, default)
+
+
 class LLMProcessor:
     """Processes messages and generates responses using LLMs"""
     
@@ -37,6 +48,9 @@ class LLMProcessor:
         self.profile = self._load_profile()
         self.prompts = self._load_prompts()
         
+        # Repeat and near-duplicate recruiter messages reuse the earlier response
+        self._response_cache = ResponseCache(max_entries=512, similarity_threshold=0.95)
+        
         # Initialize provider
         if provider == "ollama":
             if not OLLAMA_AVAILABLE:
@@ -74,11 +88,14 @@ class LLMProcessor:
     def generate_response(self, 
                          message: str, 
                          channel: str,
-                         conversation_state: Dict,
+                         conversation_state: Any,
                          context: Optional[Dict] = None) -> Dict:
         """
         Generate a response to a recruiter message
         
+        Args:
+            conversation_state: ConversationState (or a dict with the same keys)
+        
         Returns:
             Dict with keys:
                 - response: The generated message
@@ -89,18 +106,34 @@ class LLMProcessor:
         """
         
         # Determine conversation stage
-        current_stage = conversation_state.get('stage', 'initial_contact')
+        current_stage = _state_get(conversation_state, 'stage', 'initial_contact')
         
         # Build context for LLM
         system_prompt = self._build_system_prompt(current_stage, channel)
         user_prompt = self._build_user_prompt(message, conversation_state, context)
         
+        # Cached responses carry extracted_info and are addressed to one recruiter, so hits
+        # never cross threads: exact hits need the same thread and prompts, semantic hits a
+        # near-identical message in the same thread at the same stage. Calls without a
+        # thread (e.g. interview prompts) only get exact hits.
+        thread_id = _state_get(conversation_state, 'thread_id')
+        prompt_hash = hashlib.sha1(f"{system_prompt}\0{user_prompt}".encode('utf-8')).hexdigest()
+        cache_key = f"{channel}:{thread_id}:{current_stage}:{prompt_hash}"
+        namespace = f"{channel}:{thread_id}:{current_stage}"
+        semantic_text = message if thread_id else None
+        
+        cached = self._response_cache.get(cache_key, text=semantic_text, namespace=namespace)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         # Generate response
         llm_output = self._call_llm(system_prompt, user_prompt)
         
         # Parse and structure response
         result = self._parse_llm_output(llm_output, message, current_stage)
         
+        self._response_cache.put(cache_key, copy.deepcopy(result), text=semantic_text, namespace=namespace)
+        
         return result
     
     def _build_system_prompt(self, stage: str, channel: str) -> str:
@@ -128,12 +161,13 @@ Stage-specific guidance:
         
         return base_prompt + profile_info
     
-    def _build_user_prompt(self, message: str, state: Dict, context: Optional[Dict]) -> str:
+    def _build_user_prompt(self, message: str, state: Any, context: Optional[Dict]) -> str:
         """Build user prompt with message and context"""
         
         history_summary = ""
-        if state.get('conversation_history'):
-            recent = state['conversation_history'][-3:]  # Last 3 messages
+        conversation_history = _state_get(state, 'conversation_history')
+        if conversation_history:
+            recent = conversation_history[-3:]  # Last 3 messages
             history_summary = "\n\nRecent conversation:\n" + "\n".join([
                 f"{msg.get('direction', '?')}: {msg.get('content', '')[:100]}"
                 for msg in recent
@@ -141,11 +175,11 @@ Stage-specific guidance:
         
         known_info = f"""
 Known information about this opportunity:
-- Company: {state.get('company', 'Unknown')}
-- Position: {state.get('position', 'Unknown')}
-- Recruiter: {state.get('recruiter_name', 'Unknown')}
-- Work arrangement: {state.get('work_arrangement', 'Not specified')}
-- Salary: {state.get('salary_range', 'Not specified')}
+- Company: {_state_get(state, 'company', 'Unknown')}
+- Position: {_state_get(state, 'position', 'Unknown')}
+- Recruiter: {_state_get(state, 'recruiter_name', 'Unknown')}
+- Work arrangement: {_state_get(state, 'work_arrangement', 'Not specified')}
+- Salary: {_state_get(state, 'salary_range', 'Not specified')}
 """
         
         prompt = f"""
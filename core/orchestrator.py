@@ -3,15 +3,41 @@ Central Orchestrator - Coordinates all agents and manages conversation flow
 """
 
 import os
-from typing import Dict, List, Optional
+import re
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from functools import cached_property
 from dotenv import load_dotenv
 
+from core.config import Config
 from core.state_manager import StateManager, ConversationState
-from core.llm_processor import LLMProcessor
 from agents.email_agent import EmailAgent
 from agents.sms_agent import SMSAgent
-from agents.interview_agent import InterviewAgent
+
+# Child of main.py's 'ai-recruiter' logger so output goes through its handlers
+log = logging.getLogger('ai-recruiter.orchestrator')
+
+# Fields copied from the LLM's extracted_info onto the conversation state
+_EXTRACTABLE_FIELDS = ('company', 'position', 'recruiter_name', 'salary_range', 'work_arrangement')
+
+# Where interview links show up in recruiter emails, in priority order
+_INTERVIEW_PATTERNS = [
+    re.compile(r'https://[^\s<>"]*interview[^\s<>"]*', re.IGNORECASE),
+    re.compile(r'join[^"\'<>]*?meeting[^"\'<>]*?[:=]\s*([^\s"\'<>]+)', re.IGNORECASE),
+    re.compile(r'interview[^"\'<>]*?link[^"\'<>]*?[:=]\s*([^\s"\'<>]+)', re.IGNORECASE),
+    re.compile(r'interview[^"\'<>]*?url[^"\'<>]*?[:=]\s*([^\s"\'<>]+)', re.IGNORECASE),
+]
+
+
+def _url_run_start(text: str, index: int) -> int:
+    """Start of the run of URL characters (no whitespace, <, > or ") containing index"""
+    while index > 0 and not text[index - 1].isspace() and text[index - 1] not in '<>"':
+        index -= 1
+    return index
 
 
 class JobApplicationOrchestrator:
@@ -26,47 +52,77 @@ class JobApplicationOrchestrator:
     - Escalate when necessary
     """
     
+    # Bounds for the adaptive poll interval (seconds)
+    MIN_CHECK_INTERVAL = 30
+    MAX_CHECK_INTERVAL = 1800
+    
+    APPROVAL_FILE = 'data/pending_approvals.txt'
+    
     def __init__(self, config: Optional[Dict] = None):
         load_dotenv()
         
+        self.cfg = Config.from_env()
         self.config = config or self._load_config()
         
         # Initialize components
         self.state_manager = StateManager(
-            db_path=os.getenv('DATABASE_PATH', 'data/conversations.db')
-        )
-        
-        self.llm_processor = LLMProcessor(
-            provider=os.getenv('LLM_PROVIDER', 'ollama'),
-            model=os.getenv('OLLAMA_MODEL', 'llama2')
+            db_path=self.cfg.database_path
         )
+        atexit.register(self.state_manager.close)
         
         self.email_agent = EmailAgent(
-            credentials_path=os.getenv('GMAIL_CREDENTIALS_PATH', 'credentials/gmail_credentials.json'),
-            token_path=os.getenv('GMAIL_TOKEN_PATH', 'credentials/gmail_token.json')
+            credentials_path=self.cfg.gmail_credentials_path,
+            token_path=self.cfg.gmail_token_path
         )
         
         self.sms_agent = SMSAgent(
             email_agent=self.email_agent,
-            default_gateway=os.getenv('SMS_EMAIL_GATEWAY', '@txt.att.net')
+            default_gateway=self.cfg.sms_email_gateway
         )
         
-        # Interview agent
-        self.interview_agent = InterviewAgent(
+        self.auto_reply_enabled = self.cfg.auto_reply_enabled
+        self.require_approval = self.cfg.require_approval
+        
+        # Pending approvals are appended to one long-lived handle
+        self._approval_fh = None
+        self._approval_lock = threading.Lock()
+        if self.require_approval:
+            os.makedirs('data', exist_ok=True)
+            self._approval_fh = open(self.APPROVAL_FILE, 'a')
+            atexit.register(self._approval_fh.close)
+        
+        # Poll interval learned from recent activity, kept across restarts; the
+        # configured interval is where it starts and the slowest it backs off to
+        self._max_interval = float(min(self.MAX_CHECK_INTERVAL, self.config.get('check_interval', 300)))
+        stored_interval = self.state_manager.get_setting('check_interval')
+        self._current_interval = min(float(stored_interval or self._max_interval), self._max_interval)
+    
+    # LLM and interview agents are built on first use, so status-only runs skip them
+    
+    @cached_property
+    def llm_processor(self):
+        from core.llm_processor import LLMProcessor
+        return LLMProcessor(
+            provider=self.cfg.llm_provider,
+            model=self.cfg.ollama_model
+        )
+    
+    @cached_property
+    def interview_agent(self):
+        from agents.interview_agent import InterviewAgent
+        return InterviewAgent(
             llm_processor=self.llm_processor,
             state_manager=self.state_manager,
-            headless=os.getenv('INTERVIEW_HEADLESS', 'false').lower() == 'true'
+            headless=self.cfg.interview_headless,
+            answer_similarity_threshold=self.cfg.answer_similarity_threshold
         )
-        
-        self.auto_reply_enabled = os.getenv('AUTO_REPLY_ENABLED', 'true').lower() == 'true'
-        self.require_approval = os.getenv('REQUIRE_APPROVAL', 'false').lower() == 'true'
     
     def _load_config(self) -> Dict:
         """Load configuration from environment"""
         return {
-            'check_interval': int(os.getenv('CHECK_INTERVAL_SECONDS', '300')),
-            'auto_reply': os.getenv('AUTO_REPLY_ENABLED', 'true').lower() == 'true',
-            'require_approval': os.getenv('REQUIRE_APPROVAL', 'false').lower() == 'true',
+            'check_interval': self.cfg.check_interval,
+            'auto_reply': self.cfg.auto_reply_enabled,
+            'require_approval': self.cfg.require_approval,
         }
     
     def process_new_messages(self) -> int:
@@ -78,155 +134,253 @@ class JobApplicationOrchestrator:
         """
         processed_count = 0
         
+        log.info("Checking for new emails and SMS messages...")
+        
+        # Fetch the inbox once and route SMS gateway emails separately
+        emails, history_id = self._fetch_new_emails()
+        sms_like, regular = [], []
+        gateway_suffixes = self.sms_agent.GATEWAY_SUFFIXES
+        for email in emails:
+            # Cheap suffix check first; most inboxes have no SMS gateway mail at all
+            is_sms = (email.get('from', '').lower().endswith(gateway_suffixes)
+                      and self.sms_agent.parse_incoming_sms(email))
+            (sms_like if is_sms else regular).append(email)
+        
+        # IDs of messages that failed, retried on the next poll since the history ID moves past them
+        failed: List[str] = []
+        
         # Process emails
-        processed_count += self._process_emails()
+        processed_count += self._process_emails(regular, failed)
+        
+        # Process SMS (received as emails)
+        processed_count += self._process_sms(sms_like, failed)
+        
+        self.state_manager.set_retry_message_ids(failed)
+        if history_id:
+            self.state_manager.set_history_id(history_id)
         
-        # Process SMS (check for SMS emails)
-        processed_count += self._process_sms()
+        self._adapt_interval(processed_count)
         
         return processed_count
     
-    def _process_emails(self) -> int:
-        """Process new recruiter emails"""
-        print("Checking for new emails...")
+    def _fetch_new_emails(self) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get unread recruiter emails that arrived since the last poll
         
-        emails = self.email_agent.get_unread_recruiter_emails()
-        processed = 0
+        Uses Gmail history when a history ID is stored, and falls back to a full
+        unread scan on the first run or once the stored ID has expired. Messages
+        that failed on the previous poll are fetched again while still unread.
+        
+        Returns:
+            (emails, history ID to store once they are processed)
+        """
+        since = self.state_manager.get_history_id()
+        changes = self.email_agent.list_new_message_ids(since) if since else None
+        retry_ids = self.state_manager.get_retry_message_ids()
+        
+        if changes is None:
+            # Take the history ID first so nothing arriving during the scan is missed
+            history_id = self.email_agent.get_current_history_id()
+            emails = self.email_agent.get_unread_recruiter_emails(max_results=50)
+            seen = {email.get('id') for email in emails}
+            retry_ids = [msg_id for msg_id in retry_ids if msg_id not in seen]
+            return emails + self.email_agent.get_recruiter_emails(retry_ids), history_id
+        
+        message_ids, history_id = changes
+        # dict.fromkeys drops duplicates but keeps the retries first
+        message_ids = list(dict.fromkeys(retry_ids + message_ids))
+        return self.email_agent.get_recruiter_emails(message_ids), history_id
+    
+    def next_interval(self) -> float:
+        """Seconds to wait before the next process_new_messages() call"""
+        return self._current_interval
+    
+    def _adapt_interval(self, processed_count: int):
+        """Poll faster after activity and back off while the inbox is quiet"""
+        if processed_count:
+            interval = max(min(self.MIN_CHECK_INTERVAL, self._max_interval), self._current_interval * 0.5)
+        else:
+            interval = min(self._max_interval, self._current_interval * 1.5)
+        
+        if interval != self._current_interval:
+            self._current_interval = interval
+            self.state_manager.set_setting('check_interval', str(interval))
+    
+    def _process_emails(self, emails: List[Dict], failed: List[str]) -> int:
+        """Process new recruiter emails, appending the IDs of any that fail to failed"""
+        if not emails:
+            return 0
+        
+        to_read = []
+        interview_links = []
         
+        # Label emails immediately so we know ARIA analyzed them
+        self.email_agent.batch_modify(
+            [email.get('id') for email in emails],
+            add_labels=['AI-Recruiter/Processed']
+        )
+        
+        # Build the LLM processor up front so all workers share one instance
+        self.llm_processor
+        
+        # Emails in one thread share conversation state, so a single worker handles them in order
+        by_thread = {}
         for email in emails:
-            email_id = email.get('id')
-            thread_id = email.get('thread_id')
-            
-            try:
-                print(f"\nProcessing email from {email.get('from_name')}: {email.get('subject')}")
-                
-                # Label email immediately so we know ARIA analyzed it
-                self.email_agent.add_label(email_id, 'AI-Recruiter/Processed')
-                
-                # Get or create conversation state
-                state = self.state_manager.get_state(thread_id)
-                
-                if not state:
-                    # New conversation
-                    state = self.state_manager.create_conversation(
-                        thread_id=thread_id,
-                        channel='email',
-                        initial_message={
-                            'timestamp': datetime.now(),
-                            'channel': 'email',
-                            'direction': 'incoming',
-                            'content': email.get('body'),
-                            'metadata': {
-                                'from': email.get('from'),
-                                'from_name': email.get('from_name'),
-                                'subject': email.get('subject')
-                            }
-                        }
-                    )
+            by_thread.setdefault(email.get('thread_id'), []).append(email)
+        
+        def process_thread(thread_emails: List[Dict]) -> int:
+            processed = 0
+            for email in thread_emails:
+                if self._process_one_email(email, to_read, interview_links):
+                    processed += 1
                 else:
-                    # Existing conversation - add message
-                    self.state_manager.add_message(thread_id, {
-                        'timestamp': datetime.now(),
+                    failed.append(email.get('id'))
+            return processed
+        
+        workers = max(1, min(self.cfg.email_workers, len(by_thread)))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                processed = sum(executor.map(process_thread, by_thread.values()))
+            
+            # Playwright is bound to the thread that started it, so interviews start from here
+            for link in interview_links:
+                interview_result = self._handle_interview_link(**link)
+                if interview_result.get('success'):
+                    log.info("Interview session started: %s", link['interview_url'])
+        finally:
+            # Emails already answered must be marked read even if a later step raises
+            self.email_agent.batch_modify(to_read, remove_labels=['UNREAD'])
+        
+        return processed
+    
+    def _process_one_email(self, email: Dict, to_read: List[str], interview_links: List[Dict]) -> int:
+        """
+        Process a single recruiter email (runs on a worker thread)
+        
+        Appends the email ID to to_read when it should be marked read, and any
+        interview link to interview_links for the caller to open.
+        
+        Returns:
+            1 if the email was processed, 0 on error
+        """
+        email_id = email.get('id')
+        thread_id = email.get('thread_id')
+        
+        try:
+            now = datetime.now()
+            log.info("Processing email from %s: %s", email.get('from_name'), email.get('subject'))
+            
+            # Get or create conversation state
+            state = self.state_manager.get_state(thread_id)
+            
+            if not state:
+                # New conversation
+                state = self.state_manager.create_conversation(
+                    thread_id=thread_id,
+                    channel='email',
+                    initial_message={
+                        'timestamp': now,
                         'channel': 'email',
                         'direction': 'incoming',
                         'content': email.get('body'),
-                        'metadata': email
-                    })
-                
-                # Generate response
-                response_data = self.llm_processor.generate_response(
-                    message=email.get('body'),
-                    channel='email',
-                    conversation_state=state.__dict__ if hasattr(state, '__dict__') else {},
-                    context={'email_metadata': email}
+                        'metadata': {
+                            'from': email.get('from'),
+                            'from_name': email.get('from_name'),
+                            'subject': email.get('subject')
+                        }
+                    }
                 )
-                
-                # Update state with extracted information
-                updates = {
-                    'stage': response_data.get('next_stage', state.stage)
-                }
-                
-                extracted_info = response_data.get('extracted_info', {})
-                if extracted_info.get('company'):
-                    updates['company'] = extracted_info['company']
-                if extracted_info.get('position'):
-                    updates['position'] = extracted_info['position']
-                if extracted_info.get('recruiter_name'):
-                    updates['recruiter_name'] = extracted_info['recruiter_name']
-                if extracted_info.get('salary_range'):
-                    updates['salary_range'] = extracted_info['salary_range']
-                if extracted_info.get('work_arrangement'):
-                    updates['work_arrangement'] = extracted_info['work_arrangement']
-                
-                self.state_manager.update_state(thread_id, updates)
-                
-                # Check for interview links before escalation
-                interview_url = self._extract_interview_url(email.get('body', ''))
-                if interview_url:
-                    print(f"Interview link detected: {interview_url}")
-                    interview_result = self._handle_interview_link(
-                        interview_url=interview_url,
-                        thread_id=thread_id,
-                        company=extracted_info.get('company'),
-                        position=extracted_info.get('position')
-                    )
-                    if interview_result.get('success'):
-                        print(f"Interview session started: {interview_url}")
-                    processed += 1
-                    continue
-                
-                # Check if escalation needed
-                if response_data.get('requires_escalation'):
+            else:
+                # Existing conversation - add message
+                self.state_manager.add_message(thread_id, {
+                    'timestamp': now,
+                    'channel': 'email',
+                    'direction': 'incoming',
+                    'content': email.get('body'),
+                    'metadata': email
+                })
+            
+            # Generate response
+            response_data = self.llm_processor.generate_response(
+                message=email.get('body'),
+                channel='email',
+                conversation_state=state,
+                context={'email_metadata': email}
+            )
+            
+            # Update state with extracted information
+            updates = {
+                'stage': response_data.get('next_stage', state.stage)
+            }
+            
+            extracted_info = response_data.get('extracted_info', {})
+            for field in _EXTRACTABLE_FIELDS:
+                value = extracted_info.get(field)
+                if value:
+                    updates[field] = value
+            
+            interview_url = self._extract_interview_url(email.get('body', ''))
+            requires_escalation = not interview_url and response_data.get('requires_escalation')
+            
+            # Commit the state changes for this email together
+            with self.state_manager.transaction():
+                self.state_manager.update_fields(thread_id, **updates)
+                if requires_escalation:
                     self.state_manager.mark_for_escalation(
                         thread_id,
                         response_data.get('escalation_reason', 'Unknown reason')
                     )
-                    self._notify_escalation(thread_id, response_data)
-                    processed += 1
-                    continue
-                
-                # Send response if auto-reply enabled
-                if self.auto_reply_enabled:
-                    if self.require_approval:
-                        self._request_approval(thread_id, response_data, email)
-                    else:
-                        self._send_email_response(thread_id, response_data, email)
-                
-                # Mark email as processed
-                self.email_agent.mark_as_read(email.get('id'))
-                self.email_agent.add_label(email.get('id'), 'AI-Recruiter/Processed')
-                
-                processed += 1
-                
-            except Exception as e:
-                print(f"Error processing email: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        return processed
+            
+            # Check for interview links before escalation
+            if interview_url:
+                log.info("Interview link detected: %s", interview_url)
+                interview_links.append({
+                    'interview_url': interview_url,
+                    'thread_id': thread_id,
+                    'company': extracted_info.get('company'),
+                    'position': extracted_info.get('position')
+                })
+                return 1
+            
+            # Check if escalation needed
+            if requires_escalation:
+                self._notify_escalation(thread_id, response_data)
+                return 1
+            
+            # Send response if auto-reply enabled
+            if self.auto_reply_enabled:
+                if self.require_approval:
+                    self._request_approval(thread_id, response_data, email)
+                else:
+                    self._send_email_response(thread_id, response_data, email)
+            
+            # Mark email as processed (flushed in one batch by _process_emails)
+            to_read.append(email_id)
+            
+            return 1
+            
+        except Exception as e:
+            log.exception("Error processing email: %s", e)
+            return 0
     
-    def _process_sms(self) -> int:
-        """Process SMS messages (received as emails)"""
-        print("Checking for SMS messages...")
-        
-        # Get emails that might be SMS
-        all_emails = self.email_agent.get_unread_recruiter_emails(max_results=20)
-        
+    def _process_sms(self, emails: List[Dict], failed: List[str]) -> int:
+        """Process SMS messages (received as emails), appending the IDs of any that fail to failed"""
         processed = 0
-        for email in all_emails:
+        for email in emails:
             sms_data = self.sms_agent.parse_incoming_sms(email)
             
             if not sms_data:
                 continue
             
             try:
-                print(f"\nProcessing SMS from {sms_data['phone_number']}")
+                now = datetime.now()
+                log.info("Processing SMS from %s", sms_data['phone_number'])
                 
                 # Check for special keywords
                 special_action = self.sms_agent.handle_special_keywords(sms_data['message'])
                 
                 if special_action == 'unsubscribe':
-                    print("STOP keyword detected - marking conversation as declined")
+                    log.info("STOP keyword detected - marking conversation as declined")
                     # Handle unsubscribe
                     continue
                 
@@ -239,7 +393,7 @@ class JobApplicationOrchestrator:
                         thread_id=thread_id,
                         channel='sms',
                         initial_message={
-                            'timestamp': datetime.now(),
+                            'timestamp': now,
                             'channel': 'sms',
                             'direction': 'incoming',
                             'content': sms_data['message'],
@@ -248,7 +402,7 @@ class JobApplicationOrchestrator:
                     )
                 else:
                     self.state_manager.add_message(thread_id, {
-                        'timestamp': datetime.now(),
+                        'timestamp': now,
                         'channel': 'sms',
                         'direction': 'incoming',
                         'content': sms_data['message'],
@@ -259,7 +413,7 @@ class JobApplicationOrchestrator:
                 response_data = self.llm_processor.generate_response(
                     message=sms_data['message'],
                     channel='sms',
-                    conversation_state=state.__dict__ if hasattr(state, '__dict__') else {},
+                    conversation_state=state,
                     context={'sms_data': sms_data}
                 )
                 
@@ -279,7 +433,8 @@ class JobApplicationOrchestrator:
                 processed += 1
                 
             except Exception as e:
-                print(f"Error processing SMS: {e}")
+                log.error("Error processing SMS: %s", e)
+                failed.append(email.get('id'))
         
         return processed
     
@@ -304,79 +459,62 @@ class JobApplicationOrchestrator:
                     'content': response_text
                 })
                 
-                print(f"✓ Response sent to {original_email.get('from_name')}")
+                log.info("✓ Response sent to %s", original_email.get('from_name'))
             
         except Exception as e:
-            print(f"Error sending response: {e}")
+            log.error("Error sending response: %s", e)
     
     def _request_approval(self, thread_id: str, response_data: Dict, original_email: Dict):
         """Request human approval before sending"""
-        print("\n" + "="*60)
-        print("APPROVAL REQUIRED")
-        print("="*60)
-        print(f"From: {original_email.get('from_name')} <{original_email.get('from')}>")
-        print(f"Subject: {original_email.get('subject')}")
-        print(f"\nProposed response:\n{response_data.get('response')}")
-        print("="*60)
+        log.info(
+            "APPROVAL REQUIRED\nFrom: %s <%s>\nSubject: %s\n\nProposed response:\n%s",
+            original_email.get('from_name'),
+            original_email.get('from'),
+            original_email.get('subject'),
+            response_data.get('response')
+        )
         
         # In production, this would send a notification or open a web UI
         # For now, just log it
         
-        approval_file = 'data/pending_approvals.txt'
-        os.makedirs('data', exist_ok=True)
+        entry = (
+            f"\n{'='*60}\n"
+            f"Thread ID: {thread_id}\n"
+            f"Time: {datetime.now()}\n"
+            f"From: {original_email.get('from')}\n"
+            f"Subject: {original_email.get('subject')}\n"
+            f"\nResponse:\n{response_data.get('response')}\n"
+        )
         
-        with open(approval_file, 'a') as f:
-            f.write(f"\n{'='*60}\n")
-            f.write(f"Thread ID: {thread_id}\n")
-            f.write(f"Time: {datetime.now()}\n")
-            f.write(f"From: {original_email.get('from')}\n")
-            f.write(f"Subject: {original_email.get('subject')}\n")
-            f.write(f"\nResponse:\n{response_data.get('response')}\n")
+        # One write + flush per approval; the lock keeps parallel workers' entries whole
+        with self._approval_lock:
+            self._approval_fh.write(entry)
+            self._approval_fh.flush()
     
     def _notify_escalation(self, thread_id: str, response_data: Dict):
         """Notify about escalation requirement"""
-        print("\n" + "!"*60)
-        print("ESCALATION REQUIRED")
-        print("!"*60)
-        print(f"Thread: {thread_id}")
-        print(f"Reason: {response_data.get('escalation_reason', 'Unknown')}")
-        print("!"*60)
+        log.warning(
+            "ESCALATION REQUIRED\nThread: %s\nReason: %s",
+            thread_id,
+            response_data.get('escalation_reason', 'Unknown')
+        )
         
         # In production, send email/SMS notification
-        escalation_email = os.getenv('ESCALATION_EMAIL')
+        escalation_email = self.cfg.escalation_email
         if escalation_email:
             # Would send notification here
             pass
     
     def get_status_report(self) -> Dict:
         """Get status of all conversations"""
-        active_conversations = self.state_manager.get_active_conversations()
+        by_stage = self.state_manager.count_by_stage()
         
-        status = {
-            'total_conversations': len(active_conversations),
-            'by_stage': {},
-            'requiring_escalation': [],
-            'by_channel': {'email': 0, 'sms': 0, 'voice': 0}
+        return {
+            'total_conversations': sum(by_stage.values()),
+            'by_stage': by_stage,
+            'requiring_escalation': self.state_manager.list_escalations(),
+            'by_channel': {'email': 0, 'sms': 0, 'voice': 0, **self.state_manager.count_by_channel()}
         }
-        
-        for conv in active_conversations:
-            # Count by stage
-            stage = conv.stage
-            status['by_stage'][stage] = status['by_stage'].get(stage, 0) + 1
-            
-            # Count by channel
-            status['by_channel'][conv.channel] = status['by_channel'].get(conv.channel, 0) + 1
-            
-            # Track escalations
-            if conv.requires_escalation:
-                status['requiring_escalation'].append({
-                    'thread_id': conv.thread_id,
-                    'company': conv.company,
-                    'position': conv.position,
-                    'reason': conv.escalation_reason
-                })
-        
-        return status
     
     def print_status(self):
         """Print formatted status report"""
@@ -405,18 +543,33 @@ class JobApplicationOrchestrator:
     
     def _extract_interview_url(self, text: str) -> Optional[str]:
         """Extract interview URL from email body."""
-        import re
-        patterns = [
-            r'https://[^\s<>"]*interview[^\s<>"]*',
-            r'join[^"\'<>]*?meeting[^"\'<>]*?[:=]\s*([^\s"\'<>]+)',
-            r'interview[^"\'<>]*?link[^"\'<>]*?[:=]\s*([^\s"\'<>]+)',
-            r'interview[^"\'<>]*?url[^"\'<>]*?[:=]\s*([^\s"\'<>]+)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                url = matches[0] if isinstance(matches[0], str) else matches[0]
+        # Every pattern starts from a literal keyword; most emails have none of them
+        lowered = text.lower()
+        interview_at = lowered.find('interview')
+        join_at = lowered.find('join')
+        if interview_at == -1 and join_at == -1:
+            return None
+        
+        # Offsets into the lowercased copy are only valid if lowering kept the length
+        aligned = len(lowered) == len(text)
+        
+        url_pattern, meeting_pattern, link_pattern, url_label_pattern = _INTERVIEW_PATTERNS
+        candidates = []
+        if interview_at != -1:
+            # A URL match can start before its keyword, but not before the whitespace ahead of it
+            candidates.append((url_pattern, _url_run_start(text, interview_at) if aligned else 0))
+        if join_at != -1 and 'meeting' in lowered:
+            candidates.append((meeting_pattern, join_at if aligned else 0))
+        if interview_at != -1 and 'link' in lowered:
+            candidates.append((link_pattern, interview_at if aligned else 0))
+        if interview_at != -1 and 'url' in lowered:
+            candidates.append((url_label_pattern, interview_at if aligned else 0))
+        
+        for pattern, start in candidates:
+            match = pattern.search(text, start)
+            if match:
+                # Patterns with a capture group yield the group, the rest the whole match
+                url = match.group(match.lastindex or 0)
                 # Clean up URL
                 url = url.strip().rstrip('.,;:')
                 if url.startswith('http'):
@@ -448,6 +601,6 @@ class JobApplicationOrchestrator:
             
             return result
         except Exception as e:
-            print(f"Error starting interview: {e}")
+            log.error("Error starting interview: %s", e)
             return {"success": False, "error": str(e)}
 
@@ -2,17 +2,184 @@
 State Manager for tracking conversation context across channels
 """
 
+import asyncio
 import json
 import sqlite3
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from dataclasses import dataclass, asdict
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(value) -> str:
+    """Serialize to JSON text; values with no JSON form fall back to str()"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value, default=str)
+
+
+def _loads(text):
+    """Parse JSON text stored by _dumps"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# Conversation timestamps are Unix epoch seconds, stamped by SQLite itself where possible
+_SQL_EPOCH_NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+
+# Columns read back into a ConversationState; history comes from the messages table
+_STATE_COLUMNS = """
+    thread_id, stage, channel, company, recruiter_name, position,
+    tech_stack, salary_range, work_arrangement, location,
+    created_at, updated_at, metadata, requires_escalation, escalation_reason
+"""
+
+# Tables and indexes, created on startup if missing
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS conversations (
+    thread_id TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    company TEXT,
+    recruiter_name TEXT,
+    position TEXT,
+    tech_stack TEXT,
+    salary_range TEXT,
+    work_arrangement TEXT,
+    location TEXT,
+    created_at INTEGER,
+    updated_at INTEGER,
+    metadata TEXT,
+    requires_escalation INTEGER DEFAULT 0,
+    escalation_reason TEXT
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    thread_id TEXT NOT NULL,
+    timestamp TIMESTAMP,
+    channel TEXT,
+    direction TEXT,
+    content TEXT,
+    metadata TEXT,
+    FOREIGN KEY (thread_id) REFERENCES conversations(thread_id)
+);
+
+CREATE TABLE IF NOT EXISTS interview_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE NOT NULL,
+    company TEXT,
+    position TEXT,
+    state TEXT,
+    status TEXT DEFAULT 'active',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Small key/value store for agent bookkeeping (poll interval, etc.)
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Status report aggregates
+CREATE INDEX IF NOT EXISTS conv_stage_idx ON conversations(stage);
+CREATE INDEX IF NOT EXISTS conv_channel_idx ON conversations(channel);
+CREATE INDEX IF NOT EXISTS conv_escalation_idx ON conversations(requires_escalation);
+
+-- Per-thread history and the active-conversation listing
+CREATE INDEX IF NOT EXISTS msg_thread_ts_idx ON messages(thread_id, timestamp);
+CREATE INDEX IF NOT EXISTS conv_active_idx ON conversations(updated_at DESC)
+    WHERE stage != 'declined';
+
+-- Conversations with their message history as a JSON array, oldest message first
+CREATE VIEW IF NOT EXISTS v_conversations AS
+SELECT {columns},
+    (SELECT json_group_array(json_object(
+                'timestamp', timestamp,
+                'channel', channel,
+                'direction', direction,
+                'content', content,
+                'metadata', json(COALESCE(metadata, '{{}}'))
+            ))
+     FROM (SELECT * FROM messages m
+           WHERE m.thread_id = c.thread_id
+           ORDER BY m.timestamp, m.id)
+    ) AS conversation_history
+FROM conversations c;
+""".format(columns=_STATE_COLUMNS.strip())
+
+# Per-message statements, built once so every call passes the same string to the statement cache
+_SQL_SELECT_STATE = f"SELECT {_STATE_COLUMNS}, conversation_history FROM v_conversations WHERE thread_id = ?"
+
+_SQL_SELECT_ACTIVE = f"""
+    SELECT {_STATE_COLUMNS} FROM conversations
+    WHERE stage != 'declined'
+    ORDER BY updated_at DESC
+"""
+
+_SQL_SELECT_HISTORY = """
+    SELECT timestamp, channel, direction, content, metadata
+    FROM messages
+    WHERE thread_id = ?
+    ORDER BY timestamp ASC
+"""
+
+# Same columns, in the same order, as _STATE_COLUMNS and the tuple _save_state binds
+_SQL_SAVE_STATE = f"""
+    INSERT OR REPLACE INTO conversations ({_STATE_COLUMNS})
+    VALUES ({', '.join('?' * len(_STATE_COLUMNS.split(',')))})
+"""
+
+# Columns update_fields may set directly, and which of them hold JSON
+_UPDATABLE_COLUMNS = frozenset({
+    'stage', 'channel', 'company', 'recruiter_name', 'position', 'tech_stack',
+    'salary_range', 'work_arrangement', 'location', 'metadata',
+    'requires_escalation', 'escalation_reason'
+})
+_JSON_COLUMNS = frozenset({'tech_stack', 'metadata'})
+
+
+@lru_cache(maxsize=64)
+def _update_sql(columns: tuple) -> str:
+    """UPDATE statement for one set of columns, generated once per distinct set"""
+    # Column names come from the _UPDATABLE_COLUMNS whitelist, never from the caller
+    assignments = ''.join(f"{column} = ?, " for column in columns)
+    return f"UPDATE conversations SET {assignments}updated_at = {_SQL_EPOCH_NOW} WHERE thread_id = ?"
+
+
+_SQL_TOUCH_STATE = f"UPDATE conversations SET updated_at = {_SQL_EPOCH_NOW} WHERE thread_id = ?"
+
+_SQL_INSERT_MESSAGE = """
+    INSERT INTO messages (thread_id, timestamp, channel, direction, content, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
 
 @dataclass
 class ConversationState:
     """Represents the state of a conversation with a recruiter"""
+    # No per-instance __dict__; spelled out because dataclass(slots=True) needs Python 3.10
+    __slots__ = (
+        'thread_id', 'stage', 'channel', 'company', 'recruiter_name', 'position',
+        'tech_stack', 'salary_range', 'work_arrangement', 'location',
+        'created_at', 'updated_at', 'conversation_history', 'metadata',
+        'requires_escalation', 'escalation_reason'
+    )
+    
     thread_id: str
     stage: str  # initial_contact, information_gathering, screening, negotiation, scheduling, declined
     channel: str  # email, sms, voice
@@ -23,125 +190,216 @@ class ConversationState:
     salary_range: Optional[str]
     work_arrangement: Optional[str]  # remote, hybrid, onsite
     location: Optional[str]
-    created_at: datetime
-    updated_at: datetime
+    created_at: int  # Unix epoch seconds; converted to datetime only on request
+    updated_at: int
     conversation_history: List[Dict]
     metadata: Dict
     requires_escalation: bool
     escalation_reason: Optional[str]
+    
+    @property
+    def created_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at)
+    
+    @property
+    def updated_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.updated_at)
 
 
 class StateManager:
     """Manages conversation state using SQLite"""
     
+    # Parsed conversation states kept in memory, least recently used evicted first
+    STATE_CACHE_SIZE = 1024
+    
     def __init__(self, db_path: str = "data/conversations.db"):
         self.db_path = db_path
+        self._state_cache: "OrderedDict[str, ConversationState]" = OrderedDict()
+        # One long-lived connection shared by all threads; the lock serializes its use
+        self._lock = threading.RLock()
+        self._conn = None
+        self._local = threading.local()
         self._ensure_db_exists()
     
+    def _open(self) -> sqlite3.Connection:
+        """Open the connection in autocommit mode with the per-connection PRAGMAs applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # With WAL, NORMAL only syncs at checkpoints instead of on every commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # 64 MiB page cache and 256 MiB memory map, kept warm for the life of the connection
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        """The shared connection, held for the duration of one operation"""
+        with self._lock:
+            yield self._conn
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group all writes in the block into a single SQLite transaction
+        
+        The connection is shared, so the calling thread holds it until the
+        block ends and other threads wait rather than joining the transaction.
+        Keep the block around database work only. Nested blocks join the
+        outer transaction.
+        """
+        with self._lock:
+            depth = getattr(self._local, 'tx_depth', 0)
+            if depth == 0:
+                self._conn.execute("BEGIN")
+            self._local.tx_depth = depth + 1
+            try:
+                yield
+            except BaseException:
+                if depth == 0:
+                    self._conn.execute("ROLLBACK")
+                    # States read inside the block may reflect the discarded writes
+                    self._state_cache.clear()
+                raise
+            else:
+                if depth == 0:
+                    self._conn.execute("COMMIT")
+            finally:
+                self._local.tx_depth = depth
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+    
     def _ensure_db_exists(self):
         """Create database and tables if they don't exist"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        self._conn = conn = self._open()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conversations (
-                thread_id TEXT PRIMARY KEY,
-                stage TEXT NOT NULL,
-                channel TEXT NOT NULL,
-                company TEXT,
-                recruiter_name TEXT,
-                position TEXT,
-                tech_stack TEXT,
-                salary_range TEXT,
-                work_arrangement TEXT,
-                location TEXT,
-                created_at TIMESTAMP,
-                updated_at TIMESTAMP,
-                conversation_history TEXT,
-                metadata TEXT,
-                requires_escalation INTEGER DEFAULT 0,
-                escalation_reason TEXT
-            )
-        """)
+        # WAL lets readers and the writer work concurrently; the setting persists in the file
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
+        cursor.executescript(_SCHEMA_SQL)
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                thread_id TEXT NOT NULL,
-                timestamp TIMESTAMP,
-                channel TEXT,
-                direction TEXT,
-                content TEXT,
-                metadata TEXT,
-                FOREIGN KEY (thread_id) REFERENCES conversations(thread_id)
-            )
-        """)
+        # History used to be duplicated into a JSON column; the messages table is now the only copy
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(conversations)")]
+        if 'conversation_history' in columns:
+            try:
+                cursor.execute("ALTER TABLE conversations DROP COLUMN conversation_history")
+            except sqlite3.OperationalError:
+                pass  # SQLite before 3.35 can't drop columns; the unused column is harmless
         
-        # Create interview sessions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS interview_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT UNIQUE NOT NULL,
-                company TEXT,
-                position TEXT,
-                state TEXT,
-                status TEXT DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        # Older databases stored local ISO datetime strings; convert them to epoch seconds.
+        # Checked first so an up-to-date database opens without taking the write lock.
+        has_text_timestamps = cursor.execute(
+            "SELECT 1 FROM conversations "
+            "WHERE typeof(created_at) = 'text' OR typeof(updated_at) = 'text' LIMIT 1"
+        ).fetchone()
+        if has_text_timestamps:
+            for column in ('created_at', 'updated_at'):
+                cursor.execute(f"""
+                    UPDATE conversations
+                    SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER)
+                    WHERE typeof({column}) = 'text'
+                """)
+        
+        # Gather planner statistics once, the first time the indexes exist
+        has_stats = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if not has_stats:
+            cursor.execute("ANALYZE")
+    
+    def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Read a stored setting"""
+        with self._connection() as conn:
+            row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
         
-        conn.commit()
-        conn.close()
+        return row[0] if row else default
+    
+    def set_setting(self, key: str, value: str):
+        """Store a setting, replacing any previous value"""
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
+    
+    def get_history_id(self) -> Optional[str]:
+        """Gmail history ID the last poll finished at"""
+        return self.get_setting('gmail_history_id')
+    
+    def set_history_id(self, history_id: str):
+        """Remember the Gmail history ID for the next poll"""
+        self.set_setting('gmail_history_id', history_id)
+    
+    def get_retry_message_ids(self) -> List[str]:
+        """Gmail message IDs that failed on the last poll"""
+        value = self.get_setting('gmail_retry_ids')
+        return value.split(',') if value else []
+    
+    def set_retry_message_ids(self, message_ids: List[str]):
+        """Remember the Gmail message IDs to fetch again on the next poll"""
+        self.set_setting('gmail_retry_ids', ','.join(msg_id for msg_id in message_ids if msg_id))
     
     def save_interview_state(self, interview_url: str, state: dict):
         """Save interview state to database."""
-        import json
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO interview_sessions 
-            (url, company, position, state, updated_at) 
-            VALUES (?, ?, ?, ?, datetime('now'))
-        """, (
-            interview_url,
-            state.get("company"),
-            state.get("position"),
-            json.dumps(state)
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT OR REPLACE INTO interview_sessions 
+                (url, company, position, state, updated_at) 
+                VALUES (?, ?, ?, ?, datetime('now'))
+            """, (
+                interview_url,
+                state.get("company"),
+                state.get("position"),
+                _dumps(state)
+            ))
     
     def get_interview_state(self, interview_url: str) -> dict:
         """Get interview state from database."""
-        import json
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        row = cursor.execute(
-            "SELECT state FROM interview_sessions WHERE url = ?",
-            (interview_url,)
-        ).fetchone()
-        
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            row = cursor.execute(
+                "SELECT state FROM interview_sessions WHERE url = ?",
+                (interview_url,)
+            ).fetchone()
         
         if row:
-            return json.loads(row[0])
+            return _loads(row[0])
         return {}
     
     def update_interview_state(self, interview_url: str, update: dict):
-        """Update interview state."""
-        current = self.get_interview_state(interview_url)
-        current.update(update)
-        self.save_interview_state(interview_url, current)
+        """
+        Update interview state.
+        
+        The update is merged into the stored JSON by SQLite's json_patch in a
+        single upsert; as in a JSON merge patch, top-level None values drop the key.
+        """
+        with self._connection() as conn:
+            conn.execute("""
+                INSERT INTO interview_sessions (url, company, position, state, updated_at)
+                VALUES (?, ?, ?, ?, datetime('now'))
+                ON CONFLICT(url) DO UPDATE SET
+                    state = json_patch(COALESCE(state, '{}'), excluded.state),
+                    company = COALESCE(excluded.company, company),
+                    position = COALESCE(excluded.position, position),
+                    updated_at = excluded.updated_at
+            """, (
+                interview_url,
+                update.get("company"),
+                update.get("position"),
+                _dumps(update)
+            ))
     
     def create_conversation(self, thread_id: str, channel: str, initial_message: Dict) -> ConversationState:
         """Create a new conversation state"""
-        now = datetime.now()
+        now = int(time.time())
         
         # Ensure timestamp is serializable
         if 'timestamp' in initial_message and isinstance(initial_message['timestamp'], datetime):
@@ -166,185 +424,317 @@ class StateManager:
             escalation_reason=None
         )
         
-        self._save_state(state)
-        self._save_message(thread_id, initial_message)
+        with self.transaction():
+            self._save_state(state)
+            self._save_messages(thread_id, [initial_message])
         
         return state
     
     def get_state(self, thread_id: str) -> Optional[ConversationState]:
-        """Retrieve conversation state by thread ID"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM conversations WHERE thread_id = ?
-        """, (thread_id,))
-        
-        row = cursor.fetchone()
-        conn.close()
-        
-        if not row:
-            return None
-        
-        return self._row_to_state(row)
+        """
+        Retrieve conversation state by thread ID, with its history read from the messages table
+        
+        States are cached until the conversation is next written, and the
+        cached instance is shared between callers, so treat it as read-only.
+        """
+        with self._connection() as conn:
+            state = self._state_cache.get(thread_id)
+            if state is not None:
+                self._state_cache.move_to_end(thread_id)
+                return state
+            
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_SELECT_STATE, (thread_id,))
+            
+            row = cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            *columns, history = row
+            state = self._row_to_state(columns, _loads(history))
+            
+            self._state_cache[thread_id] = state
+            if len(self._state_cache) > self.STATE_CACHE_SIZE:
+                self._state_cache.popitem(last=False)
+            
+            return state
     
     def update_state(self, thread_id: str, updates: Dict) -> ConversationState:
-        """Update conversation state"""
-        state = self.get_state(thread_id)
-        
-        if not state:
-            raise ValueError(f"Conversation {thread_id} not found")
-        
-        # Update fields
-        for key, value in updates.items():
-            if hasattr(state, key):
-                setattr(state, key, value)
-        
-        state.updated_at = datetime.now()
-        
-        self._save_state(state)
-        return state
+        """
+        Update conversation state and return the refreshed state
+        
+        conversation_history replaces the stored messages; keys that aren't
+        editable ConversationState fields are ignored.
+        """
+        fields = {key: value for key, value in updates.items() if key in _UPDATABLE_COLUMNS}
+        history = updates.get('conversation_history')
+        
+        with self._lock:
+            with self.transaction():
+                if not self.update_fields(thread_id, **fields):
+                    raise ValueError(f"Conversation {thread_id} not found")
+                if history is not None:
+                    with self._connection() as conn:
+                        conn.execute("DELETE FROM messages WHERE thread_id = ?", (thread_id,))
+                    self._save_messages(thread_id, list(history))
+            return self.get_state(thread_id)
+    
+    def update_fields(self, thread_id: str, **fields) -> bool:
+        """
+        Set columns on a conversation with a single UPDATE, without reading it first
+        
+        Returns False if the conversation doesn't exist.
+        """
+        unknown = fields.keys() - _UPDATABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot update conversation fields: {', '.join(sorted(unknown))}")
+        
+        columns = tuple(fields)
+        values = []
+        for column in columns:
+            value = fields[column]
+            if column in _JSON_COLUMNS:
+                value = _dumps(value)
+            elif column == 'requires_escalation':
+                value = 1 if value else 0
+            values.append(value)
+        
+        with self._connection() as conn:
+            self._state_cache.pop(thread_id, None)
+            cursor = conn.execute(_update_sql(columns), (*values, thread_id))
+        
+        return cursor.rowcount > 0
     
     def add_message(self, thread_id: str, message: Dict):
         """Add a message to conversation history"""
-        # Ensure timestamp is serializable
-        if 'timestamp' in message and isinstance(message['timestamp'], datetime):
-            message['timestamp'] = message['timestamp'].isoformat()
-        
-        state = self.get_state(thread_id)
-        
-        if state:
-            state.conversation_history.append(message)
-            state.updated_at = datetime.now()
-            self._save_state(state)
-        
-        self._save_message(thread_id, message)
+        self.add_messages(thread_id, [message])
+    
+    def add_messages(self, thread_id: str, messages: List[Dict]):
+        """Add several messages to a conversation in one transaction"""
+        # Ensure timestamps are serializable
+        for message in messages:
+            if 'timestamp' in message and isinstance(message['timestamp'], datetime):
+                message['timestamp'] = message['timestamp'].isoformat()
+        
+        with self.transaction():
+            # History lives in the messages table, so only the timestamp changes here
+            with self._connection() as conn:
+                conn.execute(_SQL_TOUCH_STATE, (thread_id,))
+            
+            self._save_messages(thread_id, messages)
+            self._state_cache.pop(thread_id, None)
     
     def get_conversation_history(self, thread_id: str) -> List[Dict]:
         """Get all messages for a conversation"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT timestamp, channel, direction, content, metadata
-            FROM messages
-            WHERE thread_id = ?
-            ORDER BY timestamp ASC
-        """, (thread_id,))
-        
-        messages = []
-        for row in cursor.fetchall():
-            messages.append({
-                'timestamp': row[0],
-                'channel': row[1],
-                'direction': row[2],
-                'content': row[3],
-                'metadata': json.loads(row[4]) if row[4] else {}
-            })
-        
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_SELECT_HISTORY, (thread_id,))
+            
+            loads = _loads
+            messages = [
+                {
+                    'timestamp': timestamp,
+                    'channel': channel,
+                    'direction': direction,
+                    'content': content,
+                    'metadata': loads(metadata) if metadata else {}
+                }
+                for timestamp, channel, direction, content, metadata in cursor.fetchall()
+            ]
         return messages
     
     def get_active_conversations(self) -> List[ConversationState]:
-        """Get all active (non-declined) conversations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM conversations
-            WHERE stage != 'declined'
-            ORDER BY updated_at DESC
-        """)
-        
-        conversations = [self._row_to_state(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        return conversations
+        """Get all active (non-declined) conversations, without their message history"""
+        return list(self.iter_active_conversations())
+    
+    def iter_active_conversations(self) -> Iterator[ConversationState]:
+        """Yield active conversations, most recently updated first, a chunk of rows at a time"""
+        with self._connection() as conn:
+            cursor = conn.execute(_SQL_SELECT_ACTIVE)
+        
+        # The lock is only held while fetching, so other threads get the connection between chunks
+        try:
+            while True:
+                with self._lock:
+                    chunk = cursor.fetchmany(256)
+                if not chunk:
+                    break
+                yield from map(self._row_to_state, chunk)
+        finally:
+            # Runs when a caller stops early too, so the read doesn't stay open
+            with self._lock:
+                cursor.close()
+    
+    def count_by_stage(self) -> Dict[str, int]:
+        """Number of active conversations per stage"""
+        with self._connection() as conn:
+            rows = conn.execute("""
+                SELECT stage, COUNT(*) FROM conversations
+                WHERE stage != 'declined'
+                GROUP BY stage
+            """).fetchall()
+        
+        return dict(rows)
+    
+    def count_by_channel(self) -> Dict[str, int]:
+        """Number of active conversations per channel"""
+        with self._connection() as conn:
+            rows = conn.execute("""
+                SELECT channel, COUNT(*) FROM conversations
+                WHERE stage != 'declined'
+                GROUP BY channel
+            """).fetchall()
+        
+        return dict(rows)
+    
+    def list_escalations(self) -> List[Dict]:
+        """Active conversations waiting on a human, most recently updated first"""
+        with self._connection() as conn:
+            rows = conn.execute("""
+                SELECT thread_id, company, position, escalation_reason FROM conversations
+                WHERE requires_escalation = 1 AND stage != 'declined'
+                ORDER BY updated_at DESC
+            """).fetchall()
+        
+        return [
+            {'thread_id': thread_id, 'company': company or "", 'position': position or "", 'reason': reason}
+            for thread_id, company, position, reason in rows
+        ]
     
     def mark_for_escalation(self, thread_id: str, reason: str):
         """Mark a conversation as requiring human intervention"""
-        self.update_state(thread_id, {
-            'requires_escalation': True,
-            'escalation_reason': reason
-        })
+        if not self.update_fields(thread_id, requires_escalation=True, escalation_reason=reason):
+            raise ValueError(f"Conversation {thread_id} not found")
     
     def _save_state(self, state: ConversationState):
         """Save conversation state to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO conversations (
-                thread_id, stage, channel, company, recruiter_name, position,
-                tech_stack, salary_range, work_arrangement, location,
-                created_at, updated_at, conversation_history, metadata,
-                requires_escalation, escalation_reason
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            state.thread_id,
-            state.stage,
-            state.channel,
-            state.company,
-            state.recruiter_name,
-            state.position,
-            json.dumps(state.tech_stack),
-            state.salary_range,
-            state.work_arrangement,
-            state.location,
-            state.created_at,
-            state.updated_at,
-            json.dumps(state.conversation_history),
-            json.dumps(state.metadata),
-            1 if state.requires_escalation else 0,
-            state.escalation_reason
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            self._state_cache.pop(state.thread_id, None)
+            cursor = conn.cursor()
+            
+            cursor.execute(_SQL_SAVE_STATE, (
+                state.thread_id,
+                state.stage,
+                state.channel,
+                state.company,
+                state.recruiter_name,
+                state.position,
+                _dumps(state.tech_stack),
+                state.salary_range,
+                state.work_arrangement,
+                state.location,
+                state.created_at,
+                state.updated_at,
+                _dumps(state.metadata),
+                1 if state.requires_escalation else 0,
+                state.escalation_reason
+            ))
     
-    def _save_message(self, thread_id: str, message: Dict):
-        """Save individual message to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get timestamp and ensure it's a string
-        timestamp = message.get('timestamp', datetime.now())
-        if isinstance(timestamp, datetime):
-            timestamp = timestamp.isoformat()
-        
-        cursor.execute("""
-            INSERT INTO messages (thread_id, timestamp, channel, direction, content, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            thread_id,
-            timestamp,
-            message.get('channel', 'unknown'),
-            message.get('direction', 'incoming'),
-            message.get('content', ''),
-            json.dumps(message.get('metadata', {}))
-        ))
-        
-        conn.commit()
-        conn.close()
+    def _save_messages(self, thread_id: str, messages: List[Dict]):
+        """Insert messages into the database with a single executemany"""
+        now = datetime.now().isoformat()
+        dumps = _dumps
+        
+        def rows():
+            for message in messages:
+                # Get timestamp and ensure it's a string
+                timestamp = message.get('timestamp', now)
+                if isinstance(timestamp, datetime):
+                    timestamp = timestamp.isoformat()
+                
+                yield (
+                    thread_id,
+                    timestamp,
+                    message.get('channel', 'unknown'),
+                    message.get('direction', 'incoming'),
+                    message.get('content', ''),
+                    dumps(message.get('metadata', {}))
+                )
+        
+        with self._connection() as conn:
+            conn.executemany(_SQL_INSERT_MESSAGE, rows())
     
-    def _row_to_state(self, row) -> ConversationState:
+    def _row_to_state(self, row, history: Optional[List[Dict]] = None) -> ConversationState:
         """Convert database row to ConversationState object"""
+        # One positional unpack (in _STATE_COLUMNS order) instead of a name lookup per column
+        (thread_id, stage, channel, company, recruiter_name, position,
+         tech_stack, salary_range, work_arrangement, location,
+         created_at, updated_at, metadata, requires_escalation, escalation_reason) = row
+        
         return ConversationState(
-            thread_id=row[0],
-            stage=row[1],
-            channel=row[2],
-            company=row[3] or "",
-            recruiter_name=row[4] or "",
-            position=row[5] or "",
-            tech_stack=json.loads(row[6]) if row[6] else [],
-            salary_range=row[7],
-            work_arrangement=row[8],
-            location=row[9],
-            created_at=datetime.fromisoformat(row[10]) if row[10] else datetime.now(),
-            updated_at=datetime.fromisoformat(row[11]) if row[11] else datetime.now(),
-            conversation_history=json.loads(row[12]) if row[12] else [],
-            metadata=json.loads(row[13]) if row[13] else {},
-            requires_escalation=bool(row[14]),
-            escalation_reason=row[15]
+            thread_id=thread_id,
+            stage=stage,
+            channel=channel,
+            company=company or "",
+            recruiter_name=recruiter_name or "",
+            position=position or "",
+            # Empty containers are the common case and need no parsing
+            tech_stack=_loads(tech_stack) if tech_stack and tech_stack != '[]' else [],
+            salary_range=salary_range,
+            work_arrangement=work_arrangement,
+            location=location,
+            created_at=created_at or int(time.time()),
+            updated_at=updated_at or int(time.time()),
+            conversation_history=history or [],
+            metadata=_loads(metadata) if metadata and metadata != '{}' else {},
+            requires_escalation=bool(requires_escalation),
+            escalation_reason=escalation_reason
         )
 
+
+class AsyncStateManager:
+    """
+    Awaitable front end to StateManager for code running on an event loop
+    
+    Each call runs the synchronous method in a worker thread, so the loop is
+    never blocked on SQLite. All calls share the wrapped manager's connection
+    and state cache, and whatever it is doing from other threads.
+    """
+    
+    def __init__(self, state_manager: Optional[StateManager] = None, db_path: str = "data/conversations.db"):
+        self.sync = state_manager or StateManager(db_path)
+    
+    async def get_state(self, thread_id: str) -> Optional[ConversationState]:
+        return await asyncio.to_thread(self.sync.get_state, thread_id)
+    
+    async def create_conversation(self, thread_id: str, channel: str, initial_message: Dict) -> ConversationState:
+        return await asyncio.to_thread(self.sync.create_conversation, thread_id, channel, initial_message)
+    
+    async def update_state(self, thread_id: str, updates: Dict) -> ConversationState:
+        return await asyncio.to_thread(self.sync.update_state, thread_id, updates)
+    
+    async def add_message(self, thread_id: str, message: Dict):
+        await asyncio.to_thread(self.sync.add_message, thread_id, message)
+    
+    async def add_messages(self, thread_id: str, messages: List[Dict]):
+        await asyncio.to_thread(self.sync.add_messages, thread_id, messages)
+    
+    async def get_conversation_history(self, thread_id: str) -> List[Dict]:
+        return await asyncio.to_thread(self.sync.get_conversation_history, thread_id)
+    
+    async def get_active_conversations(self) -> List[ConversationState]:
+        return await asyncio.to_thread(self.sync.get_active_conversations)
+    
+    async def mark_for_escalation(self, thread_id: str, reason: str):
+        await asyncio.to_thread(self.sync.mark_for_escalation, thread_id, reason)
+    
+    async def save_interview_state(self, interview_url: str, state: dict):
+        await asyncio.to_thread(self.sync.save_interview_state, interview_url, state)
+    
+    async def get_interview_state(self, interview_url: str) -> dict:
+        return await asyncio.to_thread(self.sync.get_interview_state, interview_url)
+    
+    async def update_interview_state(self, interview_url: str, update: dict):
+        await asyncio.to_thread(self.sync.update_interview_state, interview_url, update)
+    
+    async def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return await asyncio.to_thread(self.sync.get_setting, key, default)
+    
+    async def set_setting(self, key: str, value: str):
+        await asyncio.to_thread(self.sync.set_setting, key, value)
+    
+    async def close(self):
+        await asyncio.to_thread(self.sync.close)
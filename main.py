@@ -7,6 +7,7 @@ import sys
 import time
 import argparse
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 
 from core.orchestrator import JobApplicationOrchestrator
@@ -43,18 +44,22 @@ def run_once(orchestrator: JobApplicationOrchestrator):
         traceback.print_exc()
 
 
-def run_daemon(orchestrator: JobApplicationOrchestrator, interval: int = 300):
-    """Run agent continuously in daemon mode"""
+def run_daemon(orchestrator: JobApplicationOrchestrator, interval: Optional[int] = None):
+    """Run agent continuously in daemon mode (adaptive interval unless one is given)"""
     logger.info("Starting AI Recruiter Agent in daemon mode")
-    logger.info(f"Check interval: {interval} seconds")
+    if interval is not None:
+        logger.info(f"Check interval: {interval} seconds")
+    else:
+        logger.info("Check interval: adaptive")
     logger.info("Press Ctrl+C to stop\n")
     
     try:
         while True:
             run_once(orchestrator)
             
-            logger.info(f"\nNext check in {interval} seconds...")
-            time.sleep(interval)
+            delay = interval if interval is not None else orchestrator.next_interval()
+            logger.info(f"\nNext check in {delay:.0f} seconds...")
+            time.sleep(delay)
             
     except KeyboardInterrupt:
         logger.info("\n\nStopping AI Recruiter Agent...")
@@ -148,8 +153,8 @@ def view_conversation(orchestrator: JobApplicationOrchestrator, thread_id: str):
     print(f"Work Arrangement: {state.work_arrangement or 'Not specified'}")
     print(f"Salary Range: {state.salary_range or 'Not specified'}")
     print(f"Escalation: {'Yes - ' + state.escalation_reason if state.requires_escalation else 'No'}")
-    print(f"Created: {state.created_at}")
-    print(f"Updated: {state.updated_at}")
+    print(f"Created: {state.created_datetime}")
+    print(f"Updated: {state.updated_datetime}")
     
     print("\nConversation History:")
     print("-"*80)
@@ -207,7 +212,8 @@ def main():
     parser.add_argument('--daemon', action='store_true', help='Run continuously in background')
     parser.add_argument('--once', action='store_true', help='Process messages once and exit')
     parser.add_argument('--interactive', action='store_true', help='Run in interactive mode')
-    parser.add_argument('--interval', type=int, default=300, help='Check interval in seconds (daemon mode)')
+    parser.add_argument('--interval', type=int, default=None,
+                        help='Fixed check interval in seconds (daemon mode, default: adaptive)')
     parser.add_argument('--setup-check', action='store_true', help='Check if setup is complete')
     
     args = parser.parse_args()
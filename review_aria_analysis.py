@@ -19,7 +19,7 @@ print()
 cursor.execute("""
     SELECT thread_id, company, recruiter_name, position, stage, 
            conversation_history, requires_escalation, escalation_reason
-    FROM conversations
+    FROM v_conversations
     ORDER BY created_at DESC
 """)
 
@@ -18,8 +18,10 @@ print()
 # Get all conversations with details
 cursor.execute("""
     SELECT thread_id, company, recruiter_name, position, stage,
-           created_at, updated_at, conversation_history
-    FROM conversations
+           datetime(created_at, 'unixepoch', 'localtime'),
+           datetime(updated_at, 'unixepoch', 'localtime'),
+           conversation_history
+    FROM v_conversations
     ORDER BY created_at DESC
 """)
 
@@ -2,6 +2,8 @@
 Quick test to see what ARIA would respond to Alex's email
 """
 
+import sys
+
 # Alex's offer details
 alex_offer = {
     'recruiter_name': 'Alex',
@@ -19,12 +21,12 @@ elena_requirements = {
     'target_hourly': 75
 }
 
-# Generate counter-offer response
-counter_offer_response = f"""Hi Alex,
+# Counter-offer text, built once at import and filled in with format_map
+COUNTER_OFFER_TEMPLATE = """Hi Alex,
 
 Thank you for the opportunity with Artech Information Systems in Alpharetta, GA. The Java Selenium Automation Architect role looks interesting and aligns well with my expertise in Java Selenium automation architecture.
 
-However, the offered rate of ${alex_offer['offered_rate']}/hr is below my current market rate for architect-level positions. Based on my 10+ years of experience designing and implementing enterprise automation frameworks, CI/CD pipeline integration, and establishing architecture standards across projects, I'm targeting ${elena_requirements['minimum_hourly']}-${elena_requirements['target_hourly']}/hr.
+However, the offered rate of ${offered_rate}/hr is below my current market rate for architect-level positions. Based on my 10+ years of experience designing and implementing enterprise automation frameworks, CI/CD pipeline integration, and establishing architecture standards across projects, I'm targeting ${minimum_hourly}-${target_hourly}/hr.
 
 I'm confident I can deliver strong value given my extensive background in:
 - Designing scalable automation frameworks with Java and Selenium
@@ -32,7 +34,7 @@ I'm confident I can deliver strong value given my extensive background in:
 - Defining architecture standards for enterprise-level projects
 - Leading QA automation initiatives
 
-The 6-month contract duration and {alex_offer['start_date']} start date work well for my availability. Would there be flexibility on the rate? If so, I'd be very interested in discussing this opportunity further.
+The 6-month contract duration and {start_date} start date work well for my availability. Would there be flexibility on the rate? If so, I'd be very interested in discussing this opportunity further.
 
 Best regards,
 Elena
@@ -42,62 +44,83 @@ ARIA (Automated Recruiter Interaction Assistant)
 Responding on behalf of Elena Mereanu
 """
 
-# Analysis
-print("=" * 80)
-print("ARIA's ANALYSIS OF ALEX'S OFFER")
-print("=" * 80)
-print()
-print(f"Position: {alex_offer['position']}")
-print(f"  [YES] Matches title requirement (Architect)")
-print()
-print(f"Offered Rate: ${alex_offer['offered_rate']}/hr")
-print(f"  [NO] BELOW your ${elena_requirements['minimum_hourly']}/hr minimum")
-print(f"  Gap: ${elena_requirements['minimum_hourly'] - 48} - ${elena_requirements['minimum_hourly'] - 45}/hr under target")
-print()
-print(f"Location: {alex_offer['location']}")
-print(f"  [YES] Acceptable (you're open to Alpharetta/Atlanta area)")
-print()
-print(f"Duration: {alex_offer['duration']}")
-print(f"  [YES] Meets your 3+ month minimum")
-print()
-print(f"Tech Stack: Java, Selenium, CI/CD")
-print(f"  [YES] Perfect match for your skills")
-print()
-print("=" * 80)
-print("ARIA's RECOMMENDED ACTION: COUNTER-OFFER")
-print("=" * 80)
-print()
-print("ARIA will send the following response:")
-print()
-print(counter_offer_response)
-print()
-print("=" * 80)
-print("KEY POINTS IN RESPONSE:")
-print("=" * 80)
-print("[+] Professional and respectful tone")
-print("[+] Acknowledges the opportunity")
-print("[+] Clear about rate expectations ($65-75/hr)")
-print("[+] Highlights relevant experience and value")
-print("[+] Leaves door open for negotiation")
-print("[+] ARIA disclosure in signature (transparent AI assistance)")
-print()
-print("=" * 80)
-print("NEXT STEPS:")
-print("=" * 80)
-print()
-print("Option 1: Send this response manually")
-print("  - Copy the response above")
-print("  - Reply to Alex's email")
-print("  - See how he responds")
-print()
-print("Option 2: Let ARIA send it automatically")
-print("  - Complete Gmail API setup (15 mins)")
-print("  - Run: python main.py --once")
-print("  - ARIA will detect and respond to Alex's email")
-print()
-print("Option 3: Modify the response")
-print("  - Edit config/prompts.yaml")
-print("  - Adjust the counter_offer template")
-print("  - Run this script again to see changes")
-print()
 
+def build_counter_offer(offer: dict, requirements: dict) -> str:
+    """Fill the counter-offer template from an offer and the rate requirements"""
+    return COUNTER_OFFER_TEMPLATE.format_map({**offer, **requirements})
+
+
+def build_report(offer: dict, requirements: dict) -> str:
+    """ARIA's analysis of the offer, the response it would send and next steps"""
+    minimum = requirements['minimum_hourly']
+    rule = "=" * 80
+    
+    lines = [
+        rule,
+        "ARIA's ANALYSIS OF ALEX'S OFFER",
+        rule,
+        "",
+        f"Position: {offer['position']}",
+        "  [YES] Matches title requirement (Architect)",
+        "",
+        f"Offered Rate: ${offer['offered_rate']}/hr",
+        f"  [NO] BELOW your ${minimum}/hr minimum",
+        f"  Gap: ${minimum - 48} - ${minimum - 45}/hr under target",
+        "",
+        f"Location: {offer['location']}",
+        "  [YES] Acceptable (you're open to Alpharetta/Atlanta area)",
+        "",
+        f"Duration: {offer['duration']}",
+        "  [YES] Meets your 3+ month minimum",
+        "",
+        "Tech Stack: Java, Selenium, CI/CD",
+        "  [YES] Perfect match for your skills",
+        "",
+        rule,
+        "ARIA's RECOMMENDED ACTION: COUNTER-OFFER",
+        rule,
+        "",
+        "ARIA will send the following response:",
+        "",
+        build_counter_offer(offer, requirements),
+        "",
+        rule,
+        "KEY POINTS IN RESPONSE:",
+        rule,
+        "[+] Professional and respectful tone",
+        "[+] Acknowledges the opportunity",
+        "[+] Clear about rate expectations ($65-75/hr)",
+        "[+] Highlights relevant experience and value",
+        "[+] Leaves door open for negotiation",
+        "[+] ARIA disclosure in signature (transparent AI assistance)",
+        "",
+        rule,
+        "NEXT STEPS:",
+        rule,
+        "",
+        "Option 1: Send this response manually",
+        "  - Copy the response above",
+        "  - Reply to Alex's email",
+        "  - See how he responds",
+        "",
+        "Option 2: Let ARIA send it automatically",
+        "  - Complete Gmail API setup (15 mins)",
+        "  - Run: python main.py --once",
+        "  - ARIA will detect and respond to Alex's email",
+        "",
+        "Option 3: Modify the response",
+        "  - Edit config/prompts.yaml",
+        "  - Adjust the counter_offer template",
+        "  - Run this script again to see changes",
+        "",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Print the report in a single write"""
+    sys.stdout.write(build_report(alex_offer, elena_requirements))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ Utility functions
 """
 
 from utils.logger import setup_logger, log_conversation, log_escalation
+from utils.response_cache import ResponseCache, shared_cache
+from utils.retry import retry_api
 
-__all__ = ['setup_logger', 'log_conversation', 'log_escalation']
+__all__ = ['setup_logger', 'log_conversation', 'log_escalation', 'ResponseCache', 'shared_cache', 'retry_api']
 
@@ -0,0 +1,213 @@
+"""
+Response cache for LLM-generated answers
+
+Two tiers:
+- exact: lookup by a caller-supplied key (usually a hash of the prompt)
+- semantic: optional nearest-neighbour lookup over sentence embeddings,
+  used when sentence-transformers is installed and a threshold is set
+"""
+
+import os
+import atexit
+import shelve
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+
+_embedding_model = None
+
+
+def _get_embedding_model():
+    """Load the sentence-transformers model once, or return None if unavailable"""
+    global _embedding_model
+
+    if _embedding_model is None:
+        try:
+            from sentence_transformers import SentenceTransformer
+            _embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+        except Exception:
+            # Not installed or model could not be loaded - semantic tier stays off
+            _embedding_model = False
+
+    return _embedding_model or None
+
+
+@lru_cache(maxsize=1000)
+def embed_text(text: str):
+    """
+    Return a normalized embedding for text, or None if embeddings are unavailable
+
+    Results are memoized, so treat the returned array as read-only.
+    """
+    model = _get_embedding_model()
+    if model is None:
+        return None
+
+    vector = model.encode(text, normalize_embeddings=True)
+    vector.setflags(write=False)
+    return vector
+
+
+_shared_caches: Dict[str, 'ResponseCache'] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def shared_cache(path: Optional[str] = None, **kwargs) -> 'ResponseCache':
+    """
+    Return the process-wide ResponseCache for a shelve path, creating it on first use
+
+    A shelve file can't safely be opened twice, so every caller of the same
+    path shares one cache; it is closed at exit. Settings from the first call
+    apply. Without a path each call gets its own in-memory cache.
+    """
+    if not path:
+        return ResponseCache(**kwargs)
+
+    key = os.path.abspath(path)
+    with _shared_caches_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = _shared_caches[key] = ResponseCache(path=path, **kwargs)
+            atexit.register(cache.close)
+        return cache
+
+
+class ResponseCache:
+    """Exact + semantic cache for expensive LLM responses"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 similarity_threshold: Optional[float] = None):
+        """
+        Args:
+            path: Optional shelve file for persisting entries across runs
+            max_entries: Optional LRU bound for the in-memory tier
+            similarity_threshold: Cosine similarity needed for a semantic hit
+                (None disables the semantic tier)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._vectors: List[Tuple[str, str, Any]] = []  # (namespace, key, embedding)
+        self._vectors_loaded = path is None
+        self._db: Optional[shelve.Shelf] = None
+        self._lock = threading.Lock()
+
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def get(self, key: str, text: Optional[str] = None, namespace: str = '') -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Exact cache key
+            text: Text to match semantically when the exact lookup misses
+            namespace: Semantic matches are only considered within a namespace
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            if self.path:
+                record = self._shelf().get(key)
+                if record is not None:
+                    self._remember(key, record['value'])
+                    return record['value']
+
+        if not text or self.similarity_threshold is None:
+            return None
+
+        # Embedding is the slow part; do it before taking the lock so other threads aren't held up
+        query = embed_text(text)
+        if query is None:
+            return None
+
+        with self._lock:
+            return self._semantic_get(query, namespace)
+
+    def put(self, key: str, value: Any, text: Optional[str] = None, namespace: str = ''):
+        """Store a value under key, indexing text for semantic lookups"""
+        vector = None
+        if text and self.similarity_threshold is not None:
+            vector = embed_text(text)
+
+        with self._lock:
+            self._remember(key, value)
+
+            if vector is not None:
+                self._load_vectors()
+                self._vectors.append((namespace, key, vector))
+
+            if self.path:
+                db = self._shelf()
+                db[key] = {
+                    'value': value,
+                    'namespace': namespace,
+                    'embedding': vector.tolist() if vector is not None else None,
+                }
+                db.sync()
+
+    def close(self):
+        """Close the backing shelve file, if one was opened"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _shelf(self) -> shelve.Shelf:
+        """The backing shelve file, opened on first use and kept open until close()"""
+        if self._db is None:
+            self._db = shelve.open(self.path)
+        return self._db
+
+    def _remember(self, key: str, value: Any):
+        """Insert into the in-memory tier, evicting the least recently used entry"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        if self.max_entries and len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            if not self.path:
+                # Without a backing store the semantic entry can't be resolved any more
+                self._vectors = [v for v in self._vectors if v[1] != evicted]
+
+    def _semantic_get(self, query, namespace: str) -> Optional[Any]:
+        """Return the value of the stored text most similar to the query embedding, above the threshold"""
+        self._load_vectors()
+
+        best_key, best_score = None, self.similarity_threshold
+        for entry_namespace, key, vector in self._vectors:
+            if entry_namespace != namespace:
+                continue
+            score = float(vector @ query)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+
+        if best_key in self._entries:
+            return self._entries[best_key]
+
+        record = self._shelf().get(best_key)
+        return record['value'] if record else None
+
+    def _load_vectors(self):
+        """Load persisted embeddings the first time the semantic tier is used"""
+        if self._vectors_loaded:
+            return
+        self._vectors_loaded = True
+
+        import numpy as np
+
+        db = self._shelf()
+        for key in db.keys():
+            record: Dict = db[key]
+            if record.get('embedding') is not None:
+                self._vectors.append((record.get('namespace', ''), key, np.asarray(record['embedding'])))
@@ -0,0 +1,51 @@
+"""
+Retry helpers for Google API calls
+"""
+
+import time
+import random
+import functools
+
+from googleapiclient.errors import HttpError
+
+# Rate limit and transient server errors worth retrying
+RETRYABLE_STATUSES = (429, 500, 503)
+
+# A 5xx on a write may come after the change was applied, so writes only retry rate limits
+RATE_LIMIT_STATUSES = (429,)
+
+
+def retry_api(max_attempts: int = 5, base: float = 0.5, statuses=RETRYABLE_STATUSES):
+    """
+    Retry a Google API call on transient HTTP errors with exponential backoff
+
+    Honors the Retry-After header when the server sends one; other
+    errors, and the last failed attempt, are re-raised.
+
+    Args:
+        max_attempts: Total number of attempts
+        base: Delay in seconds before the first retry (doubled each attempt)
+        statuses: HTTP statuses that are retried
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return func(*args, **kwargs)
+                except HttpError as error:
+                    if error.resp.status not in statuses or attempt == max_attempts - 1:
+                        raise
+                    time.sleep(_retry_delay(error, base * 2 ** attempt))
+        return wrapper
+    return decorator
+
+
+def _retry_delay(error: HttpError, backoff: float) -> float:
+    """Seconds to wait before retrying, from Retry-After or the backoff schedule"""
+    retry_after = error.resp.get('retry-after')
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        # Jitter keeps parallel clients from retrying in lockstep
+        return backoff + random.uniform(0, backoff)